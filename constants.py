@@ -1,11 +1,50 @@
 CREDENTIALS_FILE = "data/credentials.json"
 USER_DATA_FILE = "data/user_data.json"
 FILES_DATA_DIR = "data/arquivos/"
+DATABASE_FILE = "data/role_bac.db"
+SECURITY_JOURNAL_FILE = "data/security.journal"
+KDF_CONFIG_FILE = "data/kdf.json"
+ACL_FILE = "data/acl.json"
+ACL_GROUPS_FILE = "data/acl_groups.json"
+ROLES_FILE = "data/roles.json"
+POLICY_GENERATION_FILE = "data/policy.gen"
+ACL_GENERATION_FILE = "data/acl.gen"
+AUTH_SOCKET_FILE = "data/auth.sock"
+LOG_FILE = "data/logs/role_bac.log"
+AUDIT_DIR = "data/audit"
+
+STORAGE_BACKEND = "json"
 
 MAX_LOGIN_ATTEMPTS = 5
 LOCK_DURATION_MINUTES = 15
+JOURNAL_COMPACT_THRESHOLD = 1000
+
+DEFAULT_KDF_PARAMS = {"name": "scrypt", "n": 16384, "r": 8, "p": 1}
+KDF_TARGET_MS = 50
+
+AUDIT_INDEX_FLUSH_EVERY = 256
+DECISION_CACHE_SIZE = 4096
+FILE_INDEX_RESCAN_SECONDS = 30
+
+DEFAULT_ROLES = {
+    "leitor": {"inherits": [], "grants": ["leitura"]},
+    "editor": {"inherits": ["leitor"], "grants": ["escrita"]},
+    "admin": {"inherits": ["editor"], "grants": ["remocao"]}
+}
+
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+LOG_LEVELS = {
+    "*": "INFO",
+    "app": "INFO",
+    "auth": "INFO",
+    "files": "INFO",
+    "storage": "INFO",
+    "audit": "INFO"
+}
 
 AUTH_SUCCESS = "success"
 AUTH_LOCKED = "locked"
 AUTH_NOT_FOUND = "not_found"
 AUTH_WRONG_PASSWORD = "wrong_password"
+AUTH_MIGRATION_REQUIRED = "migration_required"
@@ -0,0 +1,193 @@
+import threading
+from constants import ACL_FILE, ACL_GROUPS_FILE, ACL_GENERATION_FILE
+from core.storage import JsonBackend, open_backend
+from core.permissions import PERMISSION_BITS, PolicyGeneration, permissions_to_mask, mask_to_permissions, policy_generation, decision_cache
+
+ROOT = "/"
+ALL_PERMISSIONS = sum(PERMISSION_BITS.values())
+NO_RULE = (0, 0)
+
+def acl_chain(path):
+    chain = []
+    if path and path != ROOT:
+        chain.append(path)
+        parts = path.rstrip("/").split("/")[:-1]
+        for depth in range(len(parts), 0, -1):
+            chain.append("/".join(parts[:depth]) + "/")
+    chain.append(ROOT)
+    return chain
+
+class FileAcl:
+    def __init__(self, store=None, group_store=None, generation=None):
+        self.store = store or open_backend("acl", JsonBackend(ACL_FILE))
+        self.group_store = group_store or open_backend("acl_groups", JsonBackend(ACL_GROUPS_FILE))
+        self.generation = generation or PolicyGeneration(ACL_GENERATION_FILE)
+        self._index = None
+        self._holders = {}
+        self._groups = {}
+        self._generation = None
+        self._lock = threading.RLock()
+
+    def _compile_entry(self, entry, groups):
+        rules = {}
+        for kind in ("allow", "deny"):
+            for principal, names in entry.get(kind, {}).items():
+                mask = permissions_to_mask({name: True for name in names})
+                members = groups.get(principal[1:], ()) if principal.startswith("@") else (principal,)
+                for member in members:
+                    allow, deny = rules.get(member, NO_RULE)
+                    rules[member] = (allow | mask, deny) if kind == "allow" else (allow, deny | mask)
+        levels = {member: (allow & ~deny, allow | deny) for member, (allow, deny) in rules.items()}
+        owner = entry.get("owner")
+        if owner:
+            levels[owner] = (ALL_PERMISSIONS, ALL_PERMISSIONS)
+        return levels
+
+    def _apply(self, path, entry):
+        for member in self._holders.pop(path, ()):
+            levels = self._index.get(member)
+            if levels is not None:
+                levels.pop(path, None)
+                if not levels:
+                    del self._index[member]
+        if entry:
+            levels = self._compile_entry(entry, self._groups)
+            for member, level in levels.items():
+                self._index.setdefault(member, {})[path] = level
+            if levels:
+                self._holders[path] = set(levels)
+
+    def compile(self):
+        self._groups = dict(self.group_store.load_all())
+        self._index = {}
+        self._holders = {}
+        for path, entry in self.store.load_all().items():
+            self._apply(path, entry)
+        return self._index
+
+    def _revalidate(self):
+        generation = self.generation.current()
+        with self._lock:
+            if self._index is None or generation != self._generation:
+                self.compile()
+                self._generation = generation
+            return self._index
+
+    def _resolve(self, levels, keys):
+        granted = 0
+        decided = 0
+        for key in keys:
+            level = levels.get(key)
+            if level is None:
+                continue
+            allow, touched = level
+            granted |= allow & ~decided
+            decided |= touched
+            if decided == ALL_PERMISSIONS:
+                break
+        return granted, decided
+
+    def effective_mask(self, username, path, default_mask=0):
+        levels = self._revalidate().get(username)
+        if levels is None:
+            return default_mask
+        granted, decided = self._resolve(levels, acl_chain(path))
+        return granted | (default_mask & ~decided)
+
+    def can(self, username, permission, path, default_mask=0):
+        return bool(self.effective_mask(username, path, default_mask) & permission)
+
+    def evaluate_many(self, username, paths, default_mask=0, actions=ALL_PERMISSIONS):
+        levels = self._revalidate().get(username)
+        if levels is None:
+            return [default_mask & actions] * len(paths)
+        inherited = {}
+        matrix = []
+        for path in paths:
+            directory = path.rpartition("/")[0]
+            directory = directory + "/" if directory else ROOT
+            base = inherited.get(directory)
+            if base is None:
+                base = inherited[directory] = self._resolve(levels, acl_chain(directory))
+            level = levels.get(path)
+            if level is None:
+                granted, decided = base
+            else:
+                granted = level[0] | (base[0] & ~level[1])
+                decided = level[1] | base[1]
+            matrix.append((granted | (default_mask & ~decided)) & actions)
+        return matrix
+
+    def entry(self, path):
+        return self.store.get(path)
+
+    def groups(self):
+        return dict(self.group_store.load_all())
+
+    def _put_entry(self, path, entry, bump):
+        if entry:
+            self.store.put(path, entry)
+        else:
+            self.store.delete(path)
+        current = self.generation.current()
+        in_sync = self._index is not None and current == self._generation
+        if in_sync:
+            self._apply(path, entry)
+        else:
+            self._index = None
+        if bump:
+            generation = self.generation.bump()
+            if in_sync and generation == current + 1:
+                self._generation = generation
+            else:
+                self._index = None
+            policy_generation.bump()
+        else:
+            decision_cache.discard(lambda key: key[2] == path)
+
+    def set_owner(self, path, owner):
+        with self._lock:
+            current = self.entry(path)
+            entry = dict(current or {})
+            previous = entry.get("owner")
+            if owner:
+                entry["owner"] = owner
+            else:
+                entry.pop("owner", None)
+            if entry == (current or {}):
+                return
+            self._put_entry(path, entry, bump=bool(previous))
+
+    def set_rule(self, path, principal, permissions, kind="allow"):
+        if kind not in ("allow", "deny"):
+            raise ValueError(f"Tipo de regra desconhecido: {kind}")
+        with self._lock:
+            entry = dict(self.entry(path) or {})
+            rules = dict(entry.get(kind, {}))
+            names = [name for name, value in mask_to_permissions(permissions_to_mask(permissions)).items() if value]
+            if names:
+                rules[principal] = names
+            else:
+                rules.pop(principal, None)
+            if rules:
+                entry[kind] = rules
+            else:
+                entry.pop(kind, None)
+            self._put_entry(path, entry, bump=True)
+
+    def remove(self, path):
+        with self._lock:
+            if self.entry(path) is not None:
+                self._put_entry(path, None, bump=True)
+
+    def set_group(self, name, members):
+        with self._lock:
+            if members:
+                self.group_store.put(name, sorted(set(members)))
+            else:
+                self.group_store.delete(name)
+            self._index = None
+            self.generation.bump()
+        policy_generation.bump()
+
+file_acl = FileAcl()
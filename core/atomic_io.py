@@ -0,0 +1,95 @@
+import os
+import stat
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+TEMP_MARKER = ".tmp-"
+
+_local_locks = {}
+_local_guard = threading.Lock()
+
+@contextmanager
+def file_lock(path):
+    with _local_guard:
+        local = _local_locks.setdefault(os.path.abspath(path), threading.Lock())
+    with local:
+        if fcntl is None:
+            yield
+            return
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+def fsync_directory(directory):
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        os.fsync(fd)
+        return True
+    finally:
+        os.close(fd)
+
+def temp_path_for(path):
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f".{name}{TEMP_MARKER}{os.getpid()}-{threading.get_ident()}")
+
+def is_temp_name(name):
+    return name.startswith(".") and TEMP_MARKER in name
+
+class AtomicWriter:
+    def __init__(self):
+        self.writes = 0
+        self.fsyncs = 0
+        self.directory_fsyncs = 0
+        self._lock = threading.Lock()
+
+    def write(self, path, write, mode="w", encoding=None):
+        directory = os.path.dirname(path)
+        temp_path = temp_path_for(path)
+        try:
+            with open(temp_path, mode, encoding=encoding) as file:
+                write(file)
+                file.flush()
+                os.fsync(file.fileno())
+            try:
+                os.chmod(temp_path, stat.S_IMODE(os.stat(path).st_mode))
+            except OSError:
+                pass
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+        synced = fsync_directory(directory)
+        with self._lock:
+            self.writes += 1
+            self.fsyncs += 1
+            self.directory_fsyncs += synced
+
+    def write_text(self, path, content, encoding="utf-8"):
+        self.write(path, lambda file: file.write(content), encoding=encoding)
+
+    def stats(self):
+        return {
+            "writes": self.writes,
+            "fsyncs": self.fsyncs,
+            "directory_fsyncs": self.directory_fsyncs
+        }
+
+atomic_writer = AtomicWriter()
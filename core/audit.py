@@ -0,0 +1,263 @@
+import os
+import json
+import time
+import struct
+import logging
+import threading
+from array import array
+from datetime import datetime
+from constants import AUDIT_DIR, AUDIT_INDEX_FLUSH_EVERY
+from core.atomic_io import file_lock
+from utils.logger import get_logger, log_event
+
+logger = get_logger("audit")
+
+LOGIN = 1
+LOGIN_FAILED = 2
+LOGIN_BLOCKED = 3
+LOCKOUT = 4
+FILE_CREATE = 5
+FILE_READ = 6
+FILE_WRITE = 7
+FILE_DELETE = 8
+PERMISSION_DENIED = 9
+
+EVENT_NAMES = {
+    LOGIN: "login",
+    LOGIN_FAILED: "login_failed",
+    LOGIN_BLOCKED: "login_blocked",
+    LOCKOUT: "lockout",
+    FILE_CREATE: "file_create",
+    FILE_READ: "file_read",
+    FILE_WRITE: "file_write",
+    FILE_DELETE: "file_delete",
+    PERMISSION_DENIED: "permission_denied"
+}
+EVENT_CODES = {name: code for code, name in EVENT_NAMES.items()}
+
+RECORD = struct.Struct("<qBBII")
+POSTING = struct.Struct("<II")
+
+def _segment_name(timestamp_ms):
+    return datetime.fromtimestamp(timestamp_ms / 1000).strftime("%Y-%m-%d")
+
+class SegmentIndex:
+    def __init__(self):
+        self.records = 0
+        self.users = {}
+        self.files = {}
+        self.pending = []
+
+    def add(self, record_number, user_id, file_id, persisted=False):
+        if user_id:
+            self.users.setdefault(user_id, array("I")).append(record_number)
+        if file_id:
+            self.files.setdefault(file_id, array("I")).append(record_number)
+        self.records = record_number + 1
+        if not persisted:
+            self.pending.append((user_id, file_id))
+
+    @classmethod
+    def from_postings(cls, data):
+        index = cls()
+        count = len(data) // POSTING.size
+        for number, (user_id, file_id) in enumerate(POSTING.iter_unpack(data[:count * POSTING.size])):
+            index.add(number, user_id, file_id, persisted=True)
+        return index
+
+class AuditLog:
+    def __init__(self, directory=AUDIT_DIR, index_flush_every=AUDIT_INDEX_FLUSH_EVERY):
+        self.directory = directory
+        self.index_flush_every = index_flush_every
+        self._names = []
+        self._name_ids = {}
+        self._names_offset = 0
+        self._segment = None
+        self._segment_file = None
+        self._index = None
+        self._unflushed = 0
+        self._lock = threading.Lock()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _ensure_directory(self):
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+
+    def _load_names(self):
+        path = self._path("names.jsonl")
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as file:
+            file.seek(self._names_offset)
+            data = file.read()
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            name = json.loads(line)
+            self._names.append(name)
+            self._name_ids[name] = len(self._names)
+        self._names_offset += end
+
+    def _name_id(self, name):
+        if name is None:
+            return 0
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            self._load_names()
+            name_id = self._name_ids.get(name)
+        if name_id is None:
+            self._ensure_directory()
+            line = (json.dumps(name, ensure_ascii=False) + "\n").encode("utf-8")
+            with open(self._path("names.jsonl"), "ab") as file:
+                file.write(line)
+            self._names_offset += len(line)
+            self._names.append(name)
+            name_id = self._name_ids[name] = len(self._names)
+        return name_id
+
+    def _lookup_id(self, name):
+        if name not in self._name_ids:
+            self._load_names()
+        return self._name_ids.get(name)
+
+    def _name(self, name_id):
+        if name_id == 0:
+            return None
+        if name_id > len(self._names):
+            self._load_names()
+        return self._names[name_id - 1]
+
+    def _catch_up(self, index, segment, total=None):
+        log_path = self._path(f"{segment}.log")
+        if total is None:
+            total = os.path.getsize(log_path) // RECORD.size if os.path.exists(log_path) else 0
+        if total > index.records:
+            with open(log_path, "rb") as file:
+                file.seek(index.records * RECORD.size)
+                for number in range(index.records, total):
+                    _, _, _, user_id, file_id = RECORD.unpack(file.read(RECORD.size))
+                    index.add(number, user_id, file_id)
+        return index
+
+    def _load_index(self, segment):
+        try:
+            with open(self._path(f"{segment}.pst"), "rb") as file:
+                index = SegmentIndex.from_postings(file.read())
+        except OSError:
+            index = SegmentIndex()
+        return self._catch_up(index, segment)
+
+    def _flush_index(self):
+        if self._segment is None or self._index is None:
+            return
+        index = self._index
+        path = self._path(f"{self._segment}.pst")
+        first = index.records - len(index.pending)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        covered = size // POSTING.size
+        with open(path, "ab") as file:
+            if covered < first:
+                file.truncate(0)
+            else:
+                if size != covered * POSTING.size:
+                    file.truncate(covered * POSTING.size)
+                file.write(b"".join(POSTING.pack(user_id, file_id) for user_id, file_id in index.pending[covered - first:]))
+        index.pending = []
+        self._unflushed = 0
+
+    def _rotate(self, segment):
+        if self._segment_file is not None:
+            self._flush_index()
+            self._segment_file.close()
+        self._ensure_directory()
+        self._segment = segment
+        self._index = self._load_index(segment)
+        self._segment_file = open(self._path(f"{segment}.log"), "ab")
+
+    def record(self, event, user=None, filename=None, detail=0, timestamp_ms=None):
+        timestamp_ms = int(time.time() * 1000) if timestamp_ms is None else timestamp_ms
+        segment = _segment_name(timestamp_ms)
+        with self._lock:
+            try:
+                self._ensure_directory()
+                with file_lock(self._path("audit.lock")):
+                    if segment != self._segment:
+                        self._rotate(segment)
+                    user_id = self._name_id(user)
+                    file_id = self._name_id(filename)
+                    self._segment_file.write(RECORD.pack(timestamp_ms, event, detail, user_id, file_id))
+                    self._segment_file.flush()
+                    number = self._segment_file.tell() // RECORD.size - 1
+                    self._catch_up(self._index, segment, number)
+                    self._index.add(number, user_id, file_id)
+                    self._unflushed += 1
+                    if self._unflushed >= self.index_flush_every:
+                        self._flush_index()
+            except OSError as e:
+                log_event(logger, "audit_write_error", f"Erro ao gravar auditoria: {e}", logging.ERROR)
+
+    def segments(self, start=None, end=None):
+        if not os.path.exists(self.directory):
+            return []
+        names = sorted(name[:-4] for name in os.listdir(self.directory) if name.endswith(".log"))
+        if start is not None:
+            names = [name for name in names if name >= start.isoformat()]
+        if end is not None:
+            names = [name for name in names if name <= end.isoformat()]
+        return names
+
+    def query(self, user=None, filename=None, start=None, end=None, events=None):
+        with self._lock:
+            if self._segment_file is not None:
+                with file_lock(self._path("audit.lock")):
+                    self._catch_up(self._index, self._segment)
+                    self._flush_index()
+            user_id = self._lookup_id(user) if user is not None else None
+            file_id = self._lookup_id(filename) if filename is not None else None
+            if (user is not None and user_id is None) or (filename is not None and file_id is None):
+                return []
+
+            results = []
+            for segment in self.segments(start, end):
+                index = self._index if segment == self._segment else self._load_index(segment)
+                if user_id is not None and file_id is not None:
+                    candidates = sorted(set(index.users.get(user_id, ())) & set(index.files.get(file_id, ())))
+                elif user_id is not None:
+                    candidates = index.users.get(user_id, ())
+                elif file_id is not None:
+                    candidates = index.files.get(file_id, ())
+                else:
+                    candidates = range(index.records)
+                if not candidates:
+                    continue
+                with open(self._path(f"{segment}.log"), "rb") as file:
+                    for number in candidates:
+                        file.seek(number * RECORD.size)
+                        timestamp_ms, event, detail, record_user, record_file = RECORD.unpack(file.read(RECORD.size))
+                        if events is not None and event not in events:
+                            continue
+                        results.append({
+                            "timestamp": datetime.fromtimestamp(timestamp_ms / 1000),
+                            "event": EVENT_NAMES.get(event, str(event)),
+                            "detail": detail,
+                            "user": self._name(record_user),
+                            "file": self._name(record_file)
+                        })
+            return results
+
+    def close(self):
+        with self._lock:
+            if self._segment_file is not None:
+                with file_lock(self._path("audit.lock")):
+                    self._catch_up(self._index, self._segment)
+                    self._flush_index()
+                self._segment_file.close()
+                self._segment_file = None
+                self._segment = None
+                self._index = None
+
+audit_log = AuditLog()
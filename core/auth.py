@@ -1,31 +1,44 @@
+import time
+import logging
 from datetime import datetime
-from core.credentials import load_credentials, save_credentials
-from core.user_data import load_user_data, save_user_data
-from core.security import check_account_locked, reset_failed_attempts, increment_failed_attempts
-from utils.crypto import generate_salt, hash_password, verify_password
-from constants import AUTH_SUCCESS, AUTH_LOCKED, AUTH_NOT_FOUND, AUTH_WRONG_PASSWORD, MAX_LOGIN_ATTEMPTS
+from concurrent.futures import ProcessPoolExecutor
+from core.credentials import credential_store, is_legacy_credential
+from core.user_data import user_store
+from core.security import security_journal, login_limiter, check_lock, register_failure, register_success
+from core.storage import UnitOfWork, IOStats
+from core.permissions import policy_generation
+from utils.crypto import create_password_record, verify_password_record, needs_rehash
+from core.audit import audit_log, LOGIN, LOGIN_FAILED, LOGIN_BLOCKED
+from utils.logger import get_logger, log_event
+from constants import AUTH_SUCCESS, AUTH_LOCKED, AUTH_NOT_FOUND, AUTH_WRONG_PASSWORD, AUTH_MIGRATION_REQUIRED, MAX_LOGIN_ATTEMPTS
 
-def register_user(username, password, permissions):
-    if len(password) < 6:
-        return False, "Senha muito curta. Use pelo menos 6 caracteres."
+logger = get_logger("auth")
+login_io_stats = {"user_data": IOStats(), "credentials": IOStats()}
 
-    credentials = load_credentials()
-    if username in credentials:
-        return False, "Usuário já existe!"
+def _validate_registration(username, password):
+    if not username:
+        return "Nome de usuário não pode ser vazio."
+    if len(password) < 6:
+        return "Senha muito curta. Use pelo menos 6 caracteres."
+    return None
 
-    salt = generate_salt()
-    password_hash = hash_password(password, salt)
-    credentials[username] = {
-        "password": password_hash,
-        "salt": salt
-    }
-    save_credentials(credentials)
+def _registration_fields(user):
+    if not isinstance(user, dict):
+        return "Registro de usuário inválido.", "", ""
+    username = user.get("username") or ""
+    password = user.get("password") or ""
+    if not isinstance(username, str) or not isinstance(password, str):
+        return "Nome de usuário e senha devem ser texto.", str(username), ""
+    permissions = user.get("permissions")
+    if permissions is not None and not isinstance(permissions, dict):
+        return "Permissões inválidas.", username.strip(), ""
+    return None, username.strip(), password
 
-    user_data = load_user_data()
+def _new_user_record(permissions):
     if permissions is None:
         permissions = {"leitura": False, "escrita": False, "remocao": False}
 
-    user_data[username] = {
+    return {
         "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "last_login": "",
         "login_count": 0,
@@ -38,61 +51,136 @@ def register_user(username, password, permissions):
         },
         "permissions": permissions
     }
-    save_user_data(user_data)
+
+def register_user(username, password, permissions, hasher=create_password_record):
+    if len(password) < 6:
+        return False, "Senha muito curta. Use pelo menos 6 caracteres."
+
+    if credential_store.get(username) is not None:
+        return False, "Usuário já existe!"
+
+    if not credential_store.insert(username, hasher(password)):
+        return False, "Usuário já existe!"
+    user_store.put(username, _new_user_record(permissions))
+    policy_generation.bump()
     return True, f"Usuário '{username}' registrado com sucesso!"
 
-def authenticate_user(username, password):
-    print(f"[{datetime.now()}] Tentativa de login: {username}")
+def register_users(users, workers=None):
+    existing = credential_store.load_all()
+    results = []
+    pending = []
+    seen = set()
 
-    credentials = load_credentials()
+    for index, user in enumerate(users):
+        error, username, password = _registration_fields(user)
+        if error is None:
+            error = _validate_registration(username, password)
+        if error is None and (username in existing or username in seen):
+            error = "Usuário já existe!"
+        if error is not None:
+            results.append((index, username, False, error))
+            continue
+        seen.add(username)
+        pending.append((index, username, password, user.get("permissions")))
 
-    if check_account_locked(username):
-        print(f"[{datetime.now()}] Login bloqueado: {username}")
-        return False, AUTH_LOCKED
+    passwords = [password for _, _, password, _ in pending]
+    if workers == 1 or len(pending) < 2:
+        hashed = list(map(create_password_record, passwords))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            hashed = list(executor.map(create_password_record, passwords, chunksize=64))
+
+    new_credentials = {username: credential for (_, username, _, _), credential in zip(pending, hashed)}
+    inserted = set(credential_store.insert_many(new_credentials)) if new_credentials else set()
+    if inserted:
+        try:
+            user_store.put_many({
+                username: _new_user_record(permissions)
+                for _, username, _, permissions in pending if username in inserted
+            })
+        except Exception:
+            credential_store.delete_many(inserted)
+            raise
+        policy_generation.bump()
 
-    if username in credentials:
-        password_matched = False
-        user_record = credentials[username]
-
-        if isinstance(user_record, dict):
-            if "salt" in user_record:
-                stored_hash = user_record["password"]
-                stored_salt = user_record["salt"]
-                password_matched = verify_password(stored_hash, stored_salt, password)
-            else:
-                stored_password = user_record["password"]
-                salt = generate_salt()
-                password_hash = hash_password(stored_password, salt)
-                credentials[username] = {"password": password_hash, "salt": salt}
-                save_credentials(credentials)
-                password_matched = (stored_password == password)
+    for index, username, _, _ in pending:
+        if username in inserted:
+            results.append((index, username, True, f"Usuário '{username}' registrado com sucesso!"))
         else:
-            stored_password = user_record
-            salt = generate_salt()
-            password_hash = hash_password(stored_password, salt)
-            credentials[username] = {"password": password_hash, "salt": salt}
-            save_credentials(credentials)
-            password_matched = (stored_password == password)
+            results.append((index, username, False, "Usuário já existe!"))
+
+    results.sort(key=lambda result: result[0])
+    return results
+
+def _log_login_result(username, result, started):
+    success, message = result
+    latency_ms = round((time.perf_counter() - started) * 1000, 2)
+    if success:
+        event, text, level = "login_success", f"Login bem-sucedido: {username}", logging.INFO
+        audit_log.record(LOGIN, username)
+    elif message == AUTH_LOCKED:
+        event, text, level = "login_locked", f"Login bloqueado: {username}", logging.WARNING
+        audit_log.record(LOGIN_BLOCKED, username)
+    elif message == AUTH_NOT_FOUND:
+        event, text, level = "login_unknown_user", f"Usuário não encontrado: {username}", logging.INFO
+        audit_log.record(LOGIN_FAILED, username)
+    elif message == AUTH_MIGRATION_REQUIRED:
+        event, text, level = "legacy_credential", f"Credencial legada não migrada para {username}. Execute tools.migrate_credentials.", logging.WARNING
+        audit_log.record(LOGIN_FAILED, username)
+    else:
+        remaining = message.split(":")[1]
+        event, text, level = "login_failed", f"Senha incorreta para {username}. Restantes: {remaining}", logging.INFO
+        audit_log.record(LOGIN_FAILED, username)
+    log_event(logger, event, text, level, user=username, latency_ms=latency_ms)
+
+def authenticate_user(username, password, verifier=verify_password_record, hasher=create_password_record):
+    started = time.perf_counter()
+    log_event(logger, "login_attempt", f"Tentativa de login: {username}", logging.DEBUG, user=username)
+
+    user_work = UnitOfWork(user_store, username)
+    credential_work = UnitOfWork(credential_store, username)
+    result = _authenticate(username, password, user_work, credential_work, verifier, hasher)
+    user_work.commit()
+    credential_work.commit()
+    login_io_stats["user_data"].record(user_work)
+    login_io_stats["credentials"].record(credential_work)
+    _log_login_result(username, result, started)
+    return result
+
+def _authenticate(username, password, user_work, credential_work, verifier, hasher):
+    now = time.time()
+    if login_limiter.is_locked(username, now):
+        return False, AUTH_LOCKED
+
+    user = security_journal.overlay(username, user_work.load())
+    if check_lock(username, user, now):
+        return False, AUTH_LOCKED
+
+    user_record = credential_work.load()
+    if user_record is not None:
+        if is_legacy_credential(user_record):
+            return False, AUTH_MIGRATION_REQUIRED
+
+        password_matched = verifier(user_record, password)
+        if password_matched and needs_rehash(user_record):
+            credential_work.record = hasher(password)
+            credential_work.mark_dirty()
 
         if password_matched:
-            user_data = load_user_data()
-            if username in user_data:
-                user_data[username]["last_login"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                user_data[username]["login_count"] += 1
-                save_user_data(user_data)
-
-            reset_failed_attempts(username)
-            print(f"[{datetime.now()}] Login bem-sucedido: {username}")
+            if user is not None:
+                user["last_login"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                user["login_count"] += 1
+                user_work.mark_dirty()
+            register_success(username, user)
             return True, AUTH_SUCCESS
 
-        attempts = increment_failed_attempts(username)
+        attempts = register_failure(username, user, now)
         remaining = MAX_LOGIN_ATTEMPTS - attempts
-        print(f"[{datetime.now()}] Senha incorreta para {username}. Restantes: {remaining}")
 
         if remaining <= 0:
             return False, AUTH_LOCKED
         else:
             return False, f"{AUTH_WRONG_PASSWORD}:{remaining}"
 
-    print(f"[{datetime.now()}] Usuário não encontrado: {username}")
+    register_failure(username, None, now)
     return False, AUTH_NOT_FOUND
@@ -0,0 +1,60 @@
+import json
+import socket
+import threading
+from constants import AUTH_SOCKET_FILE
+
+class AuthClient:
+    def __init__(self, socket_path=AUTH_SOCKET_FILE, timeout=30):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._sock = None
+        self._reader = None
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self._sock = sock
+        self._reader = sock.makefile("rb")
+
+    def close(self):
+        if self._sock is not None:
+            self._reader.close()
+            self._sock.close()
+            self._sock = None
+            self._reader = None
+
+    def call(self, op, **args):
+        with self._lock:
+            self._next_id += 1
+            request = (json.dumps({"id": self._next_id, "op": op, "args": args}) + "\n").encode("utf-8")
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    self._sock.sendall(request)
+                    line = self._reader.readline()
+                    if not line:
+                        raise ConnectionError("Conexão encerrada pelo daemon de autenticação.")
+                    break
+                except (OSError, ConnectionError):
+                    self.close()
+                    if attempt == 1:
+                        raise
+        response = json.loads(line)
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response["result"]
+
+_client = AuthClient()
+
+def authenticate_user(username, password):
+    return tuple(_client.call("authenticate", username=username, password=password))
+
+def register_user(username, password, permissions):
+    return tuple(_client.call("register", username=username, password=password, permissions=permissions))
+
+def check_permission(username, permission):
+    return _client.call("check_permission", username=username, permission=permission)
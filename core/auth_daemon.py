@@ -0,0 +1,104 @@
+import os
+import json
+import signal
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from constants import AUTH_SOCKET_FILE
+from core.auth import authenticate_user, register_user
+from core.roles import check_permission
+from core.permissions import decision_cache
+from core.security import security_journal, lock_scheduler, schedule_pending_unlocks, compact_security_journal
+from utils.crypto import create_password_record, verify_password_record
+from utils.logger import get_logger, log_event
+
+logger = get_logger("auth")
+
+class AuthDaemon:
+    def __init__(self, socket_path=AUTH_SOCKET_FILE, hash_workers=None, store_workers=4):
+        self.socket_path = socket_path
+        self.hash_pool = ProcessPoolExecutor(max_workers=hash_workers)
+        self.store_pool = ThreadPoolExecutor(max_workers=store_workers, thread_name_prefix="auth-store")
+        self.handlers = {
+            "authenticate": self._authenticate,
+            "register": self._register,
+            "check_permission": self._check_permission,
+            "cache_stats": decision_cache.stats
+        }
+
+    def _verify(self, record, password):
+        return self.hash_pool.submit(verify_password_record, record, password).result()
+
+    def _hash(self, password):
+        return self.hash_pool.submit(create_password_record, password).result()
+
+    def _authenticate(self, username, password):
+        return authenticate_user(username, password, verifier=self._verify, hasher=self._hash)
+
+    def _register(self, username, password, permissions=None):
+        return register_user(username, password, permissions, hasher=self._hash)
+
+    def _check_permission(self, username, permission):
+        return check_permission(username, permission)
+
+    async def _dispatch(self, request):
+        handler = self.handlers.get(request.get("op"))
+        if handler is None:
+            return {"id": request.get("id"), "error": f"Operação desconhecida: {request.get('op')}"}
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self.store_pool, lambda: handler(**request.get("args", {})))
+        return {"id": request.get("id"), "result": result}
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = await self._dispatch(json.loads(line))
+                except Exception as e:
+                    response = {"error": str(e)}
+                writer.write((json.dumps(response) + "\n").encode("utf-8"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        directory = os.path.dirname(self.socket_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+        security_journal.replay()
+        schedule_pending_unlocks()
+        lock_scheduler.start()
+
+        loop = asyncio.get_running_loop()
+        stopped = loop.create_future()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, lambda: stopped.done() or stopped.set_result(None))
+
+        server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        log_event(logger, "daemon_start", f"Daemon de autenticação ouvindo em {self.socket_path}")
+        try:
+            async with server:
+                await stopped
+        finally:
+            self.close()
+            log_event(logger, "daemon_stop", "Daemon de autenticação finalizado.")
+
+    def close(self):
+        lock_scheduler.stop()
+        try:
+            compact_security_journal()
+        except Exception as e:
+            log_event(logger, "journal_compact_error", f"Erro ao compactar journal de segurança: {str(e)}", logging.ERROR)
+        self.store_pool.shutdown(wait=True)
+        self.hash_pool.shutdown(wait=True)
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
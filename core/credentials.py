@@ -1,55 +1,87 @@
 import os
 import json
 import time
-from constants import CREDENTIALS_FILE
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from constants import CREDENTIALS_FILE, STORAGE_BACKEND
+from core.storage import JsonBackend, open_backend
+from core.atomic_io import atomic_writer
+from utils.crypto import create_password_record
+from utils.logger import get_logger, log_event
+
+logger = get_logger("storage")
+
+class CredentialStore(JsonBackend):
+    def __init__(self, path=CREDENTIALS_FILE):
+        super().__init__(path)
+
+credential_store = open_backend("credentials", CredentialStore())
 
 def initialize_credentials():
+    if STORAGE_BACKEND != "json":
+        return
+
     directory = os.path.dirname(CREDENTIALS_FILE)
     if not os.path.exists(directory):
         os.makedirs(directory)
         
     try:
         if not os.path.exists(CREDENTIALS_FILE):
-            with open(CREDENTIALS_FILE, 'w') as file:
-                json.dump({}, file, indent=4)
+            atomic_writer.write(CREDENTIALS_FILE, lambda file: json.dump({}, file, indent=4))
         else:
             with open(CREDENTIALS_FILE, 'r') as file:
                 try:
                     json.load(file)
                 except json.JSONDecodeError:
-                    print(f"Arquivo de credenciais corrompido. Criando backup.")
+                    log_event(logger, "credentials_corrupted", "Arquivo de credenciais corrompido. Criando backup.", logging.ERROR)
                     backup_name = CREDENTIALS_FILE + f".bak.{int(time.time())}"
                     os.rename(CREDENTIALS_FILE, backup_name)
-                    with open(CREDENTIALS_FILE, 'w') as new_file:
-                        json.dump({}, new_file, indent=4)
+                    atomic_writer.write(CREDENTIALS_FILE, lambda file: json.dump({}, file, indent=4))
     except Exception as e:
-        print(f"Erro ao inicializar credenciais: {e}")
-        with open(CREDENTIALS_FILE, 'w') as file:
-            json.dump({}, file, indent=4)
+        log_event(logger, "credentials_init_error", f"Erro ao inicializar credenciais: {e}", logging.ERROR)
+        atomic_writer.write(CREDENTIALS_FILE, lambda file: json.dump({}, file, indent=4))
 
 def load_credentials():
-    if not os.path.exists(CREDENTIALS_FILE):
-        initialize_credentials()
-    
     try:
-        with open(CREDENTIALS_FILE, 'r') as file:
-            return json.load(file)
-    except json.JSONDecodeError:
-        print("Erro ao decodificar arquivo de credenciais. Inicializando novo arquivo.")
-        initialize_credentials()
-        return {}
+        return credential_store.load_all()
     except Exception as e:
-        print(f"Erro ao carregar credenciais: {e}")
+        log_event(logger, "credentials_read_error", f"Erro ao carregar credenciais: {e}", logging.ERROR)
         return {}
 
 def save_credentials(credentials):
-    directory = os.path.dirname(CREDENTIALS_FILE)
-    if not os.path.exists(directory):
-        os.makedirs(directory)
-        
     try:
-        with open(CREDENTIALS_FILE, 'w') as file:
-            json.dump(credentials, file, indent=4)
+        credential_store.save_all(credentials)
     except Exception as e:
-        print(f"Erro ao salvar credenciais: {e}")
+        log_event(logger, "credentials_write_error", f"Erro ao salvar credenciais: {e}", logging.ERROR)
         raise e
+
+def is_legacy_credential(record):
+    return not isinstance(record, dict) or "salt" not in record
+
+def _legacy_password(record):
+    if isinstance(record, dict):
+        return record.get("password", "")
+    return record
+
+def migrate_legacy_credentials(workers=None, dry_run=False):
+    credentials = credential_store.load_all()
+    legacy = [username for username, record in credentials.items() if is_legacy_credential(record)]
+    report = {
+        "total": len(credentials),
+        "legacy": len(legacy),
+        "migrated": [],
+        "dry_run": dry_run
+    }
+    if not legacy or dry_run:
+        return report
+
+    passwords = [_legacy_password(credentials[username]) for username in legacy]
+    if workers == 1 or len(legacy) < 2:
+        records = list(map(create_password_record, passwords))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            records = list(executor.map(create_password_record, passwords, chunksize=64))
+
+    credential_store.put_many(dict(zip(legacy, records)))
+    report["migrated"] = legacy
+    return report
@@ -1,87 +1,228 @@
 import os
+import time
+import logging
+from enum import IntEnum
+from operator import attrgetter
+from collections import namedtuple
+from core.acl import file_acl
+from core.audit import audit_log, FILE_CREATE, FILE_READ, FILE_WRITE, FILE_DELETE
+from core.atomic_io import atomic_writer, is_temp_name
+from utils.logger import get_logger, log_event
+from constants import FILE_INDEX_RESCAN_SECONDS
+
+logger = get_logger("files")
+
+class FileType(IntEnum):
+    UNKNOWN = 0
+    TEXT = 1
+    DRAWING = 2
+    SHEET = 3
+
+FILE_TYPE_LABELS = {
+    FileType.UNKNOWN: "Desconhecido",
+    FileType.TEXT: "Texto",
+    FileType.DRAWING: "Desenho",
+    FileType.SHEET: "Planilha"
+}
+
+EXTENSION_TYPES = {
+    ".txt": FileType.TEXT,
+    ".draw": FileType.DRAWING,
+    ".sheet": FileType.SHEET
+}
+
+FileEntry = namedtuple("FileEntry", ("name", "type", "size", "mtime_ns"))
+
+SORT_KEYS = {
+    "name": lambda entry: entry.name.casefold(),
+    "type": attrgetter("type"),
+    "size": attrgetter("size"),
+    "mtime": attrgetter("mtime_ns")
+}
+
+def file_type(filename):
+    return EXTENSION_TYPES.get(os.path.splitext(filename)[1], FileType.UNKNOWN)
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 2)
 
 class FileManager:
-    def __init__(self, folder="data/arquivos"):
+    def __init__(self, folder="data/arquivos", rescan_seconds=FILE_INDEX_RESCAN_SECONDS):
         self.folder = folder
+        self.rescan_seconds = rescan_seconds
+        self._names = None
+        self._signature = None
+        self._scanned_at = 0
         if not os.path.exists(self.folder):
             os.makedirs(self.folder)
-        print(f"Gerenciador de arquivos inicializado na pasta: {self.folder}")
+        log_event(logger, "file_manager_init", f"Gerenciador de arquivos inicializado na pasta: {self.folder}", logging.DEBUG)
 
     def _validate_filename(self, filename):
         if not filename or '..' in filename or '/' in filename or '\\' in filename:
             return False
         return True
 
+    def _folder_signature(self):
+        stat = os.stat(self.folder)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _index(self):
+        signature = self._folder_signature()
+        now = time.monotonic()
+        if self._names is None or signature != self._signature or now - self._scanned_at > self.rescan_seconds:
+            self._names = {item.name for item in self._regular_files()}
+            self._signature = signature
+            self._scanned_at = now
+        return self._names
+
+    def _track(self, filename, present, before):
+        if self._names is None:
+            return
+        if before != self._signature:
+            self._names = None
+            return
+        if present:
+            self._names.add(filename)
+        else:
+            self._names.discard(filename)
+        self._signature = self._folder_signature()
+
+    def invalidate(self):
+        self._names = None
+
     def list_files(self):
         try:
-            return os.listdir(self.folder)
+            return sorted(self._index())
         except Exception as e:
-            print(f"Erro ao listar arquivos: {str(e)}")
+            log_event(logger, "file_list_error", f"Erro ao listar arquivos: {str(e)}", logging.ERROR)
             return []
 
-    def create_file(self, filename, content=""):
+    def _regular_files(self):
+        with os.scandir(self.folder) as iterator:
+            for item in iterator:
+                if is_temp_name(item.name):
+                    continue
+                try:
+                    if item.is_file():
+                        yield item
+                except OSError:
+                    continue
+
+    def iter_entries(self):
+        for item in self._regular_files():
+            try:
+                stat = item.stat()
+            except OSError:
+                continue
+            yield FileEntry(item.name, file_type(item.name), stat.st_size, stat.st_mtime_ns)
+
+    def list_entries(self, sort_by=None, reverse=False):
+        try:
+            signature = self._folder_signature()
+            entries = list(self.iter_entries())
+        except Exception as e:
+            log_event(logger, "file_list_error", f"Erro ao listar arquivos: {str(e)}", logging.ERROR)
+            return []
+        if sort_by is not None:
+            entries.sort(key=SORT_KEYS[sort_by], reverse=reverse)
+        self._names = {entry.name for entry in entries}
+        self._signature = signature
+        self._scanned_at = time.monotonic()
+        return entries
+
+    def exists(self, filename):
+        try:
+            return filename in self._index()
+        except OSError:
+            return False
+
+    def stat(self, filename):
+        if not self.exists(filename):
+            return None
+        try:
+            return os.stat(os.path.join(self.folder, filename))
+        except OSError:
+            self._names.discard(filename)
+            return None
+
+    def create_file(self, filename, content="", user=None):
         if not self._validate_filename(filename):
             return False, "Nome de arquivo inválido ou inseguro."
 
         filepath = os.path.join(self.folder, filename)
-        if os.path.exists(filepath):
+        if self.exists(filename) or os.path.exists(filepath):
             return False, f"O arquivo '{filename}' já existe. Use a função edit_file para modificá-lo."
 
+        started = time.perf_counter()
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(content)
-            print(f"Arquivo criado: {filename}")
+            before = self._folder_signature()
+            atomic_writer.write_text(filepath, content)
+            self._track(filename, True, before)
+            if user is not None:
+                file_acl.set_owner(filename, user)
+            audit_log.record(FILE_CREATE, user, filename)
+            log_event(logger, "file_created", f"Arquivo criado: {filename}", file=filename, latency_ms=_elapsed_ms(started))
             return True, f"Arquivo '{filename}' criado com sucesso."
         except Exception as e:
-            print(f"Erro ao criar arquivo {filename}: {str(e)}")
+            log_event(logger, "file_error", f"Erro ao criar arquivo {filename}: {str(e)}", logging.ERROR, file=filename)
             return False, str(e)
 
-    def read_file(self, filename):
+    def read_file(self, filename, user=None):
         if not self._validate_filename(filename):
             return False, "Nome de arquivo inválido ou inseguro."
 
         filepath = os.path.join(self.folder, filename)
-        if not os.path.exists(filepath):
+        if not self.exists(filename):
             return False, "Arquivo não encontrado."
 
+        started = time.perf_counter()
         try:
             with open(filepath, "r", encoding="utf-8") as f:
                 content = f.read()
-            print(f"Arquivo lido: {filename}")
+            audit_log.record(FILE_READ, user, filename)
+            log_event(logger, "file_read", f"Arquivo lido: {filename}", file=filename, latency_ms=_elapsed_ms(started))
             return True, content
         except Exception as e:
-            print(f"Erro ao ler arquivo {filename}: {str(e)}")
+            log_event(logger, "file_error", f"Erro ao ler arquivo {filename}: {str(e)}", logging.ERROR, file=filename)
             return False, str(e)
 
-    def edit_file(self, filename, content):
+    def edit_file(self, filename, content, user=None):
         if not self._validate_filename(filename):
             return False, "Nome de arquivo inválido ou inseguro."
 
         filepath = os.path.join(self.folder, filename)
-        if not os.path.exists(filepath):
+        if not self.exists(filename):
             return False, "Arquivo não encontrado."
 
+        started = time.perf_counter()
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(content)
-            print(f"Arquivo editado: {filename}")
+            before = self._folder_signature()
+            atomic_writer.write_text(filepath, content)
+            self._track(filename, True, before)
+            audit_log.record(FILE_WRITE, user, filename)
+            log_event(logger, "file_edited", f"Arquivo editado: {filename}", file=filename, latency_ms=_elapsed_ms(started))
             return True, f"Arquivo '{filename}' editado com sucesso."
         except Exception as e:
-            print(f"Erro ao editar arquivo {filename}: {str(e)}")
+            log_event(logger, "file_error", f"Erro ao editar arquivo {filename}: {str(e)}", logging.ERROR, file=filename)
             return False, str(e)
 
-    def remove_file(self, filename):
+    def remove_file(self, filename, user=None):
         if not self._validate_filename(filename):
             return False, "Nome de arquivo inválido ou inseguro."
 
         filepath = os.path.join(self.folder, filename)
-        if not os.path.exists(filepath):
+        if not self.exists(filename):
             return False, "Arquivo não encontrado."
 
+        started = time.perf_counter()
         try:
+            before = self._folder_signature()
             os.remove(filepath)
-            print(f"Arquivo removido: {filename}")
+            self._track(filename, False, before)
+            file_acl.remove(filename)
+            audit_log.record(FILE_DELETE, user, filename)
+            log_event(logger, "file_removed", f"Arquivo removido: {filename}", file=filename, latency_ms=_elapsed_ms(started))
             return True, f"Arquivo '{filename}' removido com sucesso."
         except Exception as e:
-            print(f"Erro ao remover arquivo {filename}: {str(e)}")
+            log_event(logger, "file_error", f"Erro ao remover arquivo {filename}: {str(e)}", logging.ERROR, file=filename)
             return False, str(e)
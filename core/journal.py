@@ -0,0 +1,145 @@
+import os
+import json
+import time
+import logging
+import threading
+from constants import SECURITY_JOURNAL_FILE, JOURNAL_COMPACT_THRESHOLD
+from core.atomic_io import atomic_writer, file_lock
+from utils.logger import get_logger, log_event
+
+logger = get_logger("auth")
+
+class SecurityJournal:
+    def __init__(self, path=SECURITY_JOURNAL_FILE, compact_threshold=JOURNAL_COMPACT_THRESHOLD):
+        self.path = path
+        self.compact_threshold = compact_threshold
+        self.state = {}
+        self.entries = 0
+        self._offset = 0
+        self._inode = None
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _ensure_directory(self):
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+    def _apply_line(self, line):
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            log_event(logger, "journal_invalid_entry", f"Entrada inválida ignorada no journal de segurança: {line[:80]!r}", logging.WARNING)
+            return
+        self.state[entry["u"]] = entry["security"]
+        self.entries += 1
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _catch_up(self):
+        try:
+            stat = os.stat(self.path)
+            size, inode = stat.st_size, stat.st_ino
+        except OSError:
+            size, inode = 0, None
+        if inode != self._inode or size < self._offset:
+            self._close_file()
+            self.state = {}
+            self.entries = 0
+            self._offset = 0
+            self._inode = inode
+        if size == self._offset:
+            return
+        with open(self.path, 'rb') as file:
+            file.seek(self._offset)
+            chunk = file.read(size - self._offset)
+        end = chunk.rfind(b"\n") + 1
+        for line in chunk[:end].splitlines():
+            if line.strip():
+                self._apply_line(line.decode("utf-8"))
+        self._offset += end
+
+    def replay(self):
+        with self._lock:
+            self.state = {}
+            self.entries = 0
+            self._offset = 0
+            self._catch_up()
+        return self.state
+
+    def get(self, username):
+        with self._lock:
+            self._catch_up()
+            return self.state.get(username)
+
+    def overlay(self, username, user):
+        security = self.get(username)
+        if user is not None and security is not None:
+            user["security"] = dict(security)
+        return user
+
+    def append(self, username, op, security):
+        return self.append_many([(username, op, security)])
+
+    def append_many(self, events):
+        timestamp = int(time.time())
+        data = "".join(
+            json.dumps({"u": username, "op": op, "t": timestamp, "security": security}) + "\n"
+            for username, op, security in events
+        )
+        with self._lock, file_lock(self.path + ".lock"):
+            self._catch_up()
+            if self._file is None:
+                self._ensure_directory()
+                self._file = open(self.path, 'a', encoding="utf-8")
+                self._inode = os.fstat(self._file.fileno()).st_ino
+            self._file.write(data)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._offset += len(data.encode("utf-8"))
+            for username, _, security in events:
+                self.state[username] = dict(security)
+            self.entries += len(events)
+        return self.entries >= self.compact_threshold
+
+    def discard(self, username):
+        with self._lock:
+            self._catch_up()
+            has_state = username in self.state
+        if has_state:
+            self.append(username, "reset", {"failed_attempts": 0, "is_locked": False, "lock_time": None})
+
+    def compact(self, store):
+        with file_lock(self.path + ".compact.lock"):
+            with self._lock, file_lock(self.path + ".lock"):
+                self._catch_up()
+                if not self.state:
+                    return 0
+                snapshot = dict(self.state)
+                offset = self._offset
+
+            updates = {}
+            for username, security in snapshot.items():
+                user = store.get(username)
+                if user is not None:
+                    user["security"] = dict(security)
+                    updates[username] = user
+            if updates:
+                store.put_many(updates)
+
+            with self._lock, file_lock(self.path + ".lock"):
+                self._catch_up()
+                with open(self.path, 'rb') as file:
+                    file.seek(offset)
+                    tail = file.read(self._offset - offset)
+                self._close_file()
+                atomic_writer.write(self.path, lambda file: file.write(tail), mode="wb")
+                self.state = {}
+                self.entries = 0
+                self._offset = 0
+                self._inode = os.stat(self.path).st_ino
+                self._catch_up()
+            return len(snapshot)
@@ -0,0 +1,86 @@
+import time
+import heapq
+import logging
+import threading
+from utils.logger import get_logger, log_event
+
+logger = get_logger("auth")
+
+class LockExpiryScheduler:
+    def __init__(self, on_expire, tick_seconds=1.0):
+        self.on_expire = on_expire
+        self.tick_seconds = tick_seconds
+        self._heap = []
+        self._deadlines = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def schedule(self, username, until):
+        with self._lock:
+            self._deadlines[username] = until
+            heapq.heappush(self._heap, (until, username))
+        self._wakeup.set()
+
+    def cancel(self, username):
+        with self._lock:
+            self._deadlines.pop(username, None)
+
+    def _pop_due(self, now):
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            until, username = heapq.heappop(self._heap)
+            if self._deadlines.get(username) == until:
+                del self._deadlines[username]
+                due.append(username)
+        return due
+
+    def upcoming(self, count=10):
+        with self._lock:
+            result = []
+            for until, username in heapq.nsmallest(count + len(self._heap) - len(self._deadlines), self._heap):
+                if self._deadlines.get(username) == until:
+                    result.append((username, until))
+                    if len(result) == count:
+                        break
+            return result
+
+    def tick(self, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            due = self._pop_due(now)
+        if due:
+            try:
+                self.on_expire(due, now)
+            except Exception as e:
+                log_event(logger, "lock_expiry_error", f"Falha ao expirar bloqueios: {e}", logging.ERROR)
+        return due
+
+    def _next_wait(self):
+        with self._lock:
+            if not self._heap:
+                return self.tick_seconds
+            return max(0, min(self.tick_seconds, self._heap[0][0] - time.time()))
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self._next_wait())
+            self._wakeup.clear()
+            self.tick()
+
+    def start(self):
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="lock-expiry", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def __len__(self):
+        return len(self._deadlines)
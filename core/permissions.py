@@ -0,0 +1,107 @@
+import threading
+from collections import OrderedDict
+from constants import POLICY_GENERATION_FILE, DECISION_CACHE_SIZE
+from core.atomic_io import atomic_writer, file_lock
+
+PERM_READ = 1
+PERM_WRITE = 2
+PERM_DELETE = 4
+
+PERMISSION_BITS = {
+    "leitura": PERM_READ,
+    "escrita": PERM_WRITE,
+    "remocao": PERM_DELETE
+}
+
+def permissions_to_mask(permissions):
+    mask = 0
+    for name, bit in PERMISSION_BITS.items():
+        if permissions.get(name):
+            mask |= bit
+    return mask
+
+def mask_to_permissions(mask):
+    return {name: bool(mask & bit) for name, bit in PERMISSION_BITS.items()}
+
+class PolicyGeneration:
+    def __init__(self, path=POLICY_GENERATION_FILE):
+        self.path = path
+        self._value = 0
+
+    def _read(self):
+        try:
+            with open(self.path, 'r') as file:
+                return int(file.read().strip() or 0)
+        except (OSError, ValueError):
+            return self._value
+
+    def current(self):
+        self._value = self._read()
+        return self._value
+
+    def bump(self):
+        with file_lock(self.path + ".lock"):
+            value = self._read() + 1
+            atomic_writer.write_text(self.path, str(value))
+        self._value = value
+        return value
+
+policy_generation = PolicyGeneration()
+
+class DecisionCache:
+    def __init__(self, max_size=DECISION_CACHE_SIZE, generation=None):
+        self.max_size = max_size
+        self.generation = generation or policy_generation
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._current = None
+        self._lock = threading.Lock()
+
+    def get(self, key, compute):
+        generation = self.generation.current()
+        with self._lock:
+            if generation != self._current:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._current = generation
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        decision = compute()
+        with self._lock:
+            if generation == self._current:
+                self._entries[key] = decision
+                if len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return decision
+
+    def discard(self, predicate):
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._current = None
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "invalidations": self.invalidations
+        }
+
+decision_cache = DecisionCache()
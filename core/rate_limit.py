@@ -0,0 +1,77 @@
+import time
+import threading
+from collections import deque
+from constants import MAX_LOGIN_ATTEMPTS, LOCK_DURATION_MINUTES
+
+class LoginRateLimiter:
+    def __init__(self, max_attempts=MAX_LOGIN_ATTEMPTS, window_seconds=LOCK_DURATION_MINUTES * 60,
+                 lock_seconds=LOCK_DURATION_MINUTES * 60):
+        self.max_attempts = max_attempts
+        self.window_seconds = window_seconds
+        self.lock_seconds = lock_seconds
+        self._failures = {}
+        self._locked_until = {}
+        self._operations = 0
+        self._lock = threading.Lock()
+
+    def _expire(self, key, now):
+        until = self._locked_until.get(key)
+        if until is not None and until <= now:
+            del self._locked_until[key]
+            self._failures.pop(key, None)
+        failures = self._failures.get(key)
+        if failures:
+            while failures and failures[0] <= now - self.window_seconds:
+                failures.popleft()
+            if not failures:
+                del self._failures[key]
+
+    def _sweep(self, now):
+        for key in list(self._locked_until):
+            self._expire(key, now)
+        for key in list(self._failures):
+            self._expire(key, now)
+
+    def locked_until(self, key, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            self._expire(key, now)
+            return self._locked_until.get(key)
+
+    def is_locked(self, key, now=None):
+        return self.locked_until(key, now) is not None
+
+    def attempts(self, key, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            self._expire(key, now)
+            return len(self._failures.get(key, ()))
+
+    def record_failure(self, key, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            self._operations += 1
+            if self._operations % 4096 == 0:
+                self._sweep(now)
+            self._expire(key, now)
+            failures = self._failures.get(key)
+            if failures is None:
+                failures = self._failures[key] = deque(maxlen=self.max_attempts)
+            failures.append(now)
+            attempts = len(failures)
+            if attempts >= self.max_attempts and key not in self._locked_until:
+                self._locked_until[key] = int(now) + self.lock_seconds
+                return attempts, True
+            return attempts, False
+
+    def lock(self, key, until):
+        with self._lock:
+            self._locked_until[key] = until
+
+    def reset(self, key):
+        with self._lock:
+            self._failures.pop(key, None)
+            self._locked_until.pop(key, None)
+
+    def __len__(self):
+        return len(self._failures) + len(self._locked_until)
@@ -0,0 +1,190 @@
+import threading
+from constants import ROLES_FILE, DEFAULT_ROLES
+from core.storage import JsonBackend
+from core.user_data import user_store
+from core.permissions import PERMISSION_BITS, permissions_to_mask, policy_generation, decision_cache
+
+def _grant_mask(definition):
+    return permissions_to_mask({name: True for name in definition.get("grants", [])})
+
+class RoleRegistry:
+    def __init__(self, store=None):
+        self.store = store or JsonBackend(ROLES_FILE)
+        self._source = None
+        self._roles = {}
+        self._assignments = {}
+        self._closure = {}
+        self._heirs = {}
+        self._members = {}
+        self._user_masks = {}
+        self.recomputed_roles = 0
+        self.recomputed_users = 0
+        self._lock = threading.RLock()
+
+    def _revalidate(self):
+        data = self.store.load_all()
+        if data is self._source:
+            return
+        self._roles = {name: dict(definition) for name, definition in (data.get("roles") or DEFAULT_ROLES).items()}
+        self._assignments = {user: list(roles) for user, roles in data.get("assignments", {}).items()}
+        self._heirs = {name: set() for name in self._roles}
+        for name, definition in self._roles.items():
+            for parent in definition.get("inherits", []):
+                self._heirs.setdefault(parent, set()).add(name)
+        self._members = {}
+        for user, roles in self._assignments.items():
+            for role in roles:
+                self._members.setdefault(role, set()).add(user)
+        self._closure = {}
+        for name in self._roles:
+            self._role_closure(name)
+        self._user_masks = {}
+        for user in self._assignments:
+            self._recompute_user(user)
+        self._source = data
+
+    def _role_closure(self, name, visiting=()):
+        if name in self._closure:
+            return self._closure[name]
+        definition = self._roles.get(name)
+        if definition is None or name in visiting:
+            return 0
+        mask = _grant_mask(definition)
+        for parent in definition.get("inherits", []):
+            mask |= self._role_closure(parent, visiting + (name,))
+        self._closure[name] = mask
+        self.recomputed_roles += 1
+        return mask
+
+    def _recompute_user(self, username):
+        mask = 0
+        for role in self._assignments.get(username, ()):
+            mask |= self._closure.get(role, 0)
+        if mask or username in self._assignments:
+            self._user_masks[username] = mask
+        else:
+            self._user_masks.pop(username, None)
+        self.recomputed_users += 1
+
+    def _descendants(self, name):
+        affected = {name}
+        pending = [name]
+        while pending:
+            for heir in self._heirs.get(pending.pop(), ()):
+                if heir not in affected:
+                    affected.add(heir)
+                    pending.append(heir)
+        return affected
+
+    def _save(self):
+        data = {"roles": self._roles, "assignments": self._assignments}
+        self.store.save_all(data)
+        self._source = data
+        policy_generation.bump()
+
+    def user_mask(self, username):
+        with self._lock:
+            self._revalidate()
+            return self._user_masks.get(username, 0)
+
+    def roles_of(self, username):
+        with self._lock:
+            self._revalidate()
+            return list(self._assignments.get(username, []))
+
+    def roles(self):
+        with self._lock:
+            self._revalidate()
+            return {name: (dict(definition), self._closure.get(name, 0)) for name, definition in self._roles.items()}
+
+    def define_role(self, name, inherits=None, grants=None):
+        with self._lock:
+            self._revalidate()
+            current = self._roles.get(name, {})
+            inherits = list(current.get("inherits", [])) if inherits is None else list(inherits)
+            grants = list(current.get("grants", [])) if grants is None else list(grants)
+
+            unknown = [parent for parent in inherits if parent not in self._roles]
+            if unknown:
+                return False, f"Papel(éis) inexistente(s): {', '.join(unknown)}"
+            invalid = [grant for grant in grants if grant not in PERMISSION_BITS]
+            if invalid:
+                return False, f"Permissão(ões) inválida(s): {', '.join(invalid)}"
+            if name in self._roles and any(parent in self._descendants(name) for parent in inherits):
+                return False, "A herança informada criaria um ciclo entre papéis."
+
+            for parent in current.get("inherits", []):
+                self._heirs.get(parent, set()).discard(name)
+            for parent in inherits:
+                self._heirs.setdefault(parent, set()).add(name)
+            self._heirs.setdefault(name, set())
+            self._roles[name] = {"inherits": inherits, "grants": grants}
+
+            affected = self._descendants(name)
+            for role in affected:
+                self._closure.pop(role, None)
+            for role in affected:
+                self._role_closure(role)
+            for user in set().union(*(self._members.get(role, ()) for role in affected)):
+                self._recompute_user(user)
+
+            self._save()
+            return True, f"Papel '{name}' atualizado."
+
+    def remove_role(self, name):
+        with self._lock:
+            self._revalidate()
+            if name not in self._roles:
+                return False, "Papel não encontrado."
+            if self._heirs.get(name):
+                return False, f"O papel é herdado por: {', '.join(sorted(self._heirs[name]))}"
+            if self._members.get(name):
+                return False, f"O papel está atribuído a {len(self._members[name])} usuário(s)."
+            for parent in self._roles[name].get("inherits", []):
+                self._heirs.get(parent, set()).discard(name)
+            del self._roles[name]
+            self._heirs.pop(name, None)
+            self._closure.pop(name, None)
+            self._save()
+            return True, f"Papel '{name}' removido."
+
+    def assign(self, username, roles):
+        with self._lock:
+            self._revalidate()
+            unknown = [role for role in roles if role not in self._roles]
+            if unknown:
+                return False, f"Papel(éis) inexistente(s): {', '.join(unknown)}"
+            for role in self._assignments.get(username, []):
+                self._members.get(role, set()).discard(username)
+            if roles:
+                self._assignments[username] = list(dict.fromkeys(roles))
+                for role in roles:
+                    self._members.setdefault(role, set()).add(username)
+            else:
+                self._assignments.pop(username, None)
+            self._recompute_user(username)
+            self._save()
+            return True, f"Papéis de '{username}' atualizados."
+
+role_registry = RoleRegistry()
+
+def effective_mask(username, user):
+    return permissions_to_mask(user.get("permissions", {})) | role_registry.user_mask(username)
+
+def set_user_permissions(username, permissions):
+    user = user_store.get(username)
+    if user is None:
+        return False, "Usuário não encontrado."
+    user["permissions"] = {name: bool(permissions.get(name, False)) for name in PERMISSION_BITS}
+    user_store.put(username, user)
+    policy_generation.bump()
+    return True, f"Permissões de '{username}' atualizadas."
+
+def _decide(username, permission):
+    user = user_store.get(username)
+    if user is None or permission not in PERMISSION_BITS:
+        return False
+    return bool(effective_mask(username, user) & PERMISSION_BITS[permission])
+
+def check_permission(username, permission):
+    return decision_cache.get((username, permission, None), lambda: _decide(username, permission))
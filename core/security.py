@@ -1,41 +1,156 @@
-from datetime import datetime, timedelta
-from core.user_data import load_user_data, save_user_data
-from constants import LOCK_DURATION_MINUTES, MAX_LOGIN_ATTEMPTS
+import time
+import logging
+import threading
+from core.user_data import user_store
+from core.journal import SecurityJournal
+from core.rate_limit import LoginRateLimiter
+from core.lock_scheduler import LockExpiryScheduler
+from core.audit import audit_log, LOCKOUT
+from constants import LOCK_DURATION_MINUTES
+from utils.logger import get_logger, log_event
 
-def check_account_locked(username):
-    user_data = load_user_data()
-    if username not in user_data:
-        return False
-    security = user_data[username].get("security", {})
+logger = get_logger("auth")
+
+security_journal = SecurityJournal()
+login_limiter = LoginRateLimiter()
+_compaction = None
+_compaction_lock = threading.Lock()
+
+def expire_locks(usernames, now=None):
+    updates = {}
+    for username in usernames:
+        user = load_user_security(username)
+        if user is None:
+            continue
+        locked, changed = apply_lock_check(user, now)
+        if changed:
+            updates[username] = user
+    if updates:
+        security_journal.append_many([(username, "unlock", user["security"]) for username, user in updates.items()])
+        user_store.put_many(updates)
+    return list(updates)
+
+lock_scheduler = LockExpiryScheduler(expire_locks)
+
+def schedule_pending_unlocks():
+    for username, user in user_store.load_all().items():
+        security = security_journal.overlay(username, dict(user)).get("security", {})
+        if security.get("is_locked"):
+            until = lock_expiry(security)
+            if until is not None:
+                lock_scheduler.schedule(username, until)
+    return len(lock_scheduler)
+
+def upcoming_unlocks(count=10):
+    return lock_scheduler.upcoming(count)
+
+def load_user_security(username):
+    return security_journal.overlay(username, user_store.get(username))
+
+def record_security_event(username, user, op):
+    if security_journal.append(username, op, _security_of(user)):
+        request_compaction()
+
+def clear_security_events(username):
+    security_journal.discard(username)
+
+def compact_security_journal():
+    return security_journal.compact(user_store)
+
+def request_compaction():
+    global _compaction
+    with _compaction_lock:
+        if _compaction is not None and _compaction.is_alive():
+            return _compaction
+        _compaction = threading.Thread(target=_compact_in_background, name="journal-compact", daemon=True)
+        _compaction.start()
+        return _compaction
+
+def _compact_in_background():
+    try:
+        compact_security_journal()
+    except Exception as e:
+        log_event(logger, "journal_compact_error", f"Falha ao compactar o journal de segurança: {e}", logging.ERROR)
+
+def _security_of(user):
+    if "security" not in user:
+        user["security"] = {"failed_attempts": 0, "is_locked": False, "lock_time": None}
+    return user["security"]
+
+def lock_expiry(security):
+    until = security.get("lock_until")
+    if until is None and security.get("lock_time"):
+        lock_time = time.mktime(time.strptime(security["lock_time"], "%Y-%m-%d %H:%M:%S"))
+        until = int(lock_time) + LOCK_DURATION_MINUTES * 60
+    return until
+
+def apply_lock_check(user, now=None):
+    now = time.time() if now is None else now
+    security = user.get("security", {})
     if not security.get("is_locked", False):
+        return False, False
+    until = lock_expiry(security)
+    if until is not None and now >= until:
+        security["is_locked"] = False
+        security["failed_attempts"] = 0
+        security["lock_until"] = None
+        return False, True
+    return True, False
+
+def apply_lock(user, until, attempts):
+    security = _security_of(user)
+    security["failed_attempts"] = attempts
+    security["is_locked"] = True
+    security["lock_time"] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(until - LOCK_DURATION_MINUTES * 60))
+    security["lock_until"] = until
+
+def apply_reset(user):
+    if "security" not in user or user["security"].get("failed_attempts", 0) == 0:
         return False
-    lock_time_str = security.get("lock_time")
-    if lock_time_str:
-        lock_time = datetime.strptime(lock_time_str, "%Y-%m-%d %H:%M:%S")
-        unlock_time = lock_time + timedelta(minutes=LOCK_DURATION_MINUTES)
-        if datetime.now() > unlock_time:
-            user_data[username]["security"]["is_locked"] = False
-            user_data[username]["security"]["failed_attempts"] = 0
-            save_user_data(user_data)
-            return False
+    user["security"]["failed_attempts"] = 0
     return True
 
+def check_lock(username, user, now=None):
+    now = time.time() if now is None else now
+    if login_limiter.is_locked(username, now):
+        return True
+    if user is None:
+        return False
+    locked, changed = apply_lock_check(user, now)
+    if changed:
+        record_security_event(username, user, "unlock")
+    if locked:
+        until = lock_expiry(user["security"])
+        if until is not None:
+            login_limiter.lock(username, until)
+            lock_scheduler.schedule(username, until)
+    return locked
+
+def register_failure(username, user, now=None):
+    attempts, locked_now = login_limiter.record_failure(username, now)
+    if locked_now:
+        audit_log.record(LOCKOUT, username)
+    if locked_now and user is not None:
+        until = login_limiter.locked_until(username, now)
+        apply_lock(user, until, attempts)
+        record_security_event(username, user, "lock")
+        lock_scheduler.schedule(username, until)
+    return attempts
+
+def register_success(username, user):
+    login_limiter.reset(username)
+    if user is not None:
+        apply_reset(user)
+        clear_security_events(username)
+
+def check_account_locked(username):
+    return check_lock(username, load_user_security(username))
+
 def reset_failed_attempts(username):
-    user_data = load_user_data()
-    if username in user_data and "security" in user_data[username]:
-        user_data[username]["security"]["failed_attempts"] = 0
-        save_user_data(user_data)
+    user = load_user_security(username)
+    register_success(username, user)
+    if user is not None:
+        user_store.put(username, user)
 
 def increment_failed_attempts(username):
-    user_data = load_user_data()
-    if username not in user_data:
-        return 0
-    if "security" not in user_data[username]:
-        user_data[username]["security"] = {"failed_attempts": 0, "is_locked": False, "lock_time": None}
-    user_data[username]["security"]["failed_attempts"] += 1
-    attempts = user_data[username]["security"]["failed_attempts"]
-    if attempts >= MAX_LOGIN_ATTEMPTS:
-        user_data[username]["security"]["is_locked"] = True
-        user_data[username]["security"]["lock_time"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    save_user_data(user_data)
-    return attempts
+    return register_failure(username, load_user_security(username))
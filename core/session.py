@@ -0,0 +1,57 @@
+from core.user_data import user_store
+from core.acl import file_acl
+from core.audit import audit_log, PERMISSION_DENIED
+from core.permissions import mask_to_permissions, policy_generation, decision_cache
+from core.roles import role_registry, effective_mask
+
+class Session:
+    def __init__(self, username):
+        self.username = username
+        self.user_info = {}
+        self.mask = 0
+        self.roles = []
+        self.generation = None
+        self.refresh()
+
+    def refresh(self):
+        self.generation = policy_generation.current()
+        user = user_store.get(self.username) or {}
+        self.user_info = {
+            "created_at": user.get("created_at", "Desconhecido"),
+            "last_login": user.get("last_login", "Primeiro acesso"),
+            "login_count": user.get("login_count", 1)
+        }
+        self.mask = effective_mask(self.username, user)
+        self.roles = role_registry.roles_of(self.username)
+
+    def _revalidate(self):
+        if policy_generation.current() != self.generation:
+            self.refresh()
+
+    def file_mask(self, filename):
+        self._revalidate()
+        return file_acl.effective_mask(self.username, filename, self.mask)
+
+    def evaluate_many(self, filenames, actions):
+        self._revalidate()
+        return file_acl.evaluate_many(self.username, filenames, self.mask, actions)
+
+    def can(self, permission, filename=None):
+        if filename is not None:
+            return decision_cache.get(
+                (self.username, permission, filename),
+                lambda: bool(self.file_mask(filename) & permission)
+            )
+        self._revalidate()
+        return bool(self.mask & permission)
+
+    def require(self, permission, filename=None):
+        allowed = self.can(permission, filename)
+        if not allowed:
+            audit_log.record(PERMISSION_DENIED, self.username, filename, detail=permission)
+        return allowed
+
+    @property
+    def permissions(self):
+        self._revalidate()
+        return mask_to_permissions(self.mask)
@@ -0,0 +1,331 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from constants import STORAGE_BACKEND, DATABASE_FILE
+from core.atomic_io import atomic_writer, file_lock
+from utils.logger import get_logger, log_event
+
+logger = get_logger("storage")
+
+SQLITE_TABLES = ("credentials", "user_data", "acl", "acl_groups")
+
+class StorageBackend(ABC):
+    @abstractmethod
+    def load_all(self):
+        pass
+
+    @abstractmethod
+    def save_all(self, records):
+        pass
+
+    def get(self, key):
+        return self.load_all().get(key)
+
+    def put(self, key, record):
+        records = self.load_all()
+        records[key] = record
+        self.save_all(records)
+
+    def put_many(self, records):
+        current = self.load_all()
+        current.update(records)
+        self.save_all(current)
+
+    def insert(self, key, record):
+        if self.get(key) is not None:
+            return False
+        self.put(key, record)
+        return True
+
+    def insert_many(self, records):
+        current = self.load_all()
+        inserted = {key: record for key, record in records.items() if current.get(key) is None}
+        if inserted:
+            current.update(inserted)
+            self.save_all(current)
+        return list(inserted)
+
+    def delete(self, key):
+        records = self.load_all()
+        if key in records:
+            del records[key]
+            self.save_all(records)
+
+    def delete_many(self, keys):
+        records = self.load_all()
+        removed = [key for key in keys if key in records]
+        for key in removed:
+            del records[key]
+        if removed:
+            self.save_all(records)
+
+class JsonBackend(StorageBackend):
+    def __init__(self, path):
+        self.path = path
+        self._data = None
+        self._signature = None
+        self._write_lock = threading.RLock()
+
+    def put(self, key, record):
+        with self._write_lock:
+            super().put(key, record)
+
+    def put_many(self, records):
+        with self._write_lock:
+            super().put_many(records)
+
+    def insert(self, key, record):
+        with self._write_lock, file_lock(self.path + ".lock"):
+            return super().insert(key, record)
+
+    def insert_many(self, records):
+        with self._write_lock, file_lock(self.path + ".lock"):
+            return super().insert_many(records)
+
+    def delete(self, key):
+        with self._write_lock:
+            super().delete(key)
+
+    def delete_many(self, keys):
+        with self._write_lock:
+            super().delete_many(keys)
+
+    def _stat_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _ensure_directory(self):
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+    def _write_empty(self):
+        atomic_writer.write(self.path, lambda file: json.dump({}, file, indent=4))
+        self._data = {}
+        self._signature = self._stat_signature()
+        return self._data
+
+    def _parse(self, file):
+        return json.load(file)
+
+    def _dump(self, records, file):
+        json.dump(records, file, indent=4)
+
+    def invalidate(self):
+        self._data = None
+        self._signature = None
+
+    def load_all(self):
+        try:
+            self._ensure_directory()
+
+            signature = self._stat_signature()
+            if signature is None:
+                return self._write_empty()
+
+            if self._data is not None and signature == self._signature:
+                return self._data
+
+            if signature[1] == 0:
+                return self._write_empty()
+
+            with open(self.path, 'r') as file:
+                self._data = self._parse(file)
+            self._signature = signature
+            return self._data
+        except json.JSONDecodeError as e:
+            log_event(logger, "store_corrupted", f"Arquivo {self.path} corrompido. Criando backup e iniciando novo arquivo. Erro: {e}", logging.ERROR)
+            if os.path.exists(self.path):
+                backup_name = self.path + f".bak.{int(time.time())}"
+                os.rename(self.path, backup_name)
+            return self._write_empty()
+        except Exception as e:
+            log_event(logger, "store_read_error", f"Erro ao acessar arquivo {self.path}: {str(e)}", logging.ERROR)
+            raise
+
+    def save_all(self, records):
+        with self._write_lock:
+            self._save_all(records)
+
+    def _save_all(self, records):
+        try:
+            self._ensure_directory()
+            atomic_writer.write(self.path, lambda file: self._dump(records, file))
+            self._data = records
+            self._signature = self._stat_signature()
+        except Exception as e:
+            self.invalidate()
+            log_event(logger, "store_write_error", f"Erro ao salvar arquivo {self.path}: {e}", logging.ERROR)
+            raise e
+
+class SqliteBackend(StorageBackend):
+    def __init__(self, path, table):
+        if table not in SQLITE_TABLES:
+            raise ValueError(f"Tabela desconhecida: {table!r}")
+        self.path = path
+        self.table = table
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        with self._connection() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "username TEXT PRIMARY KEY, data TEXT NOT NULL) WITHOUT ROWID"
+            )
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for conn in connections:
+            conn.close()
+
+    def load_all(self):
+        rows = self._connection().execute(f"SELECT username, data FROM {self.table}")
+        return {username: json.loads(data) for username, data in rows}
+
+    def save_all(self, records):
+        with self._connection() as conn:
+            conn.execute(f"DELETE FROM {self.table}")
+            conn.executemany(
+                f"INSERT INTO {self.table} (username, data) VALUES (?, ?)",
+                [(key, json.dumps(record)) for key, record in records.items()]
+            )
+
+    def get(self, key):
+        row = self._connection().execute(
+            f"SELECT data FROM {self.table} WHERE username = ?", (key,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key, record):
+        with self._connection() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (username, data) VALUES (?, ?)",
+                (key, json.dumps(record))
+            )
+
+    def put_many(self, records):
+        with self._connection() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (username, data) VALUES (?, ?)",
+                [(key, json.dumps(record)) for key, record in records.items()]
+            )
+
+    def insert(self, key, record):
+        with self._connection() as conn:
+            cursor = conn.execute(
+                f"INSERT OR IGNORE INTO {self.table} (username, data) VALUES (?, ?)",
+                (key, json.dumps(record))
+            )
+            return cursor.rowcount == 1
+
+    def insert_many(self, records):
+        inserted = []
+        with self._connection() as conn:
+            for key, record in records.items():
+                cursor = conn.execute(
+                    f"INSERT OR IGNORE INTO {self.table} (username, data) VALUES (?, ?)",
+                    (key, json.dumps(record))
+                )
+                if cursor.rowcount == 1:
+                    inserted.append(key)
+        return inserted
+
+    def delete(self, key):
+        with self._connection() as conn:
+            conn.execute(f"DELETE FROM {self.table} WHERE username = ?", (key,))
+
+    def delete_many(self, keys):
+        with self._connection() as conn:
+            conn.executemany(f"DELETE FROM {self.table} WHERE username = ?", [(key,) for key in keys])
+
+def open_backend(table, json_backend):
+    if STORAGE_BACKEND == "sqlite":
+        return SqliteBackend(DATABASE_FILE, table)
+    return json_backend
+
+def migrate_json_to_sqlite(sources, db_path=DATABASE_FILE):
+    report = {}
+    for table, json_path in sources.items():
+        records = JsonBackend(json_path).load_all()
+        backend = SqliteBackend(db_path, table)
+        try:
+            backend.put_many(records)
+        finally:
+            backend.close()
+        report[table] = len(records)
+    return report
+
+class UnitOfWork:
+    def __init__(self, backend, key):
+        self.backend = backend
+        self.key = key
+        self.record = None
+        self.dirty = False
+        self.reads = 0
+        self.writes = 0
+
+    def load(self):
+        self.record = self.backend.get(self.key)
+        self.reads += 1
+        return self.record
+
+    def mark_dirty(self):
+        self.dirty = True
+
+    def commit(self):
+        if self.dirty and self.record is not None:
+            self.backend.put(self.key, self.record)
+            self.writes += 1
+            self.dirty = False
+
+class IOStats:
+    def __init__(self):
+        self.operations = 0
+        self.reads = 0
+        self.writes = 0
+        self.max_reads = 0
+        self.max_writes = 0
+
+    def record(self, *units):
+        reads = sum(unit.reads for unit in units)
+        writes = sum(unit.writes for unit in units)
+        self.operations += 1
+        self.reads += reads
+        self.writes += writes
+        self.max_reads = max(self.max_reads, reads)
+        self.max_writes = max(self.max_writes, writes)
+
+    def reset(self):
+        self.__init__()
+
+    def summary(self):
+        return {
+            "operations": self.operations,
+            "reads": self.reads,
+            "writes": self.writes,
+            "max_reads_per_operation": self.max_reads,
+            "max_writes_per_operation": self.max_writes
+        }
@@ -1,52 +1,69 @@
-import os
 import json
-import time
-from datetime import datetime
 from constants import USER_DATA_FILE
+from core.storage import JsonBackend, open_backend
+from core.user_record import UserRecord
+from core.permissions import policy_generation
+
+def _pack(username, user):
+    return UserRecord.from_dict(username, user) if isinstance(user, dict) else user
+
+def _unpack(record):
+    return record.to_dict() if isinstance(record, UserRecord) else record
+
+class UserStore(JsonBackend):
+    def __init__(self, path=USER_DATA_FILE):
+        super().__init__(path)
+
+    def _parse(self, file):
+        return {username: _pack(username, user) for username, user in json.load(file).items()}
+
+    def _dump(self, records, file):
+        if not records:
+            file.write("{}")
+            return
+        file.write("{\n")
+        for position, (username, record) in enumerate(records.items()):
+            if position:
+                file.write(",\n")
+            body = json.dumps(_unpack(record), indent=4).replace("\n", "\n    ")
+            file.write(f"    {json.dumps(username)}: {body}")
+        file.write("\n}")
+
+    def records(self):
+        return JsonBackend.load_all(self)
+
+    def load_all(self):
+        return {username: _unpack(record) for username, record in self.records().items()}
+
+    def save_all(self, records):
+        with self._write_lock:
+            self._save_all({username: _pack(username, user) for username, user in records.items()})
+
+    def get(self, key):
+        return _unpack(self.records().get(key))
+
+    def put(self, key, record):
+        self.put_many({key: record})
+
+    def put_many(self, records):
+        with self._write_lock:
+            current = self.records()
+            for username, user in records.items():
+                current[username] = _pack(username, user)
+            self._save_all(current)
+
+    def delete(self, key):
+        with self._write_lock:
+            current = self.records()
+            if key in current:
+                del current[key]
+                self._save_all(current)
+
+user_store = open_backend("user_data", UserStore())
 
 def load_user_data():
-    try:
-        directory = os.path.dirname(USER_DATA_FILE)
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-            
-        if not os.path.exists(USER_DATA_FILE):
-            with open(USER_DATA_FILE, 'w') as file:
-                json.dump({}, file, indent=4)
-            return {}
-            
-        if os.path.getsize(USER_DATA_FILE) == 0:
-            with open(USER_DATA_FILE, 'w') as file:
-                json.dump({}, file, indent=4)
-            return {}
-                
-        with open(USER_DATA_FILE, 'r') as file:
-            return json.load(file)
-    except json.JSONDecodeError as e:
-        print(f"Erro: Arquivo de dados corrompido. Criando backup e iniciando novo arquivo. Erro: {e}")
-        if os.path.exists(USER_DATA_FILE):
-            backup_name = USER_DATA_FILE + f".bak.{int(time.time())}"
-            os.rename(USER_DATA_FILE, backup_name)
-        with open(USER_DATA_FILE, 'w') as file:
-            json.dump({}, file, indent=4)
-        return {}
-    except Exception as e:
-        print(f"Erro ao acessar arquivo de dados: {str(e)}")
-        directory = os.path.dirname(USER_DATA_FILE)
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-        with open(USER_DATA_FILE, 'w') as file:
-            json.dump({}, file, indent=4)
-        return {}
+    return user_store.load_all()
 
 def save_user_data(user_data):
-    try:
-        directory = os.path.dirname(USER_DATA_FILE)
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-            
-        with open(USER_DATA_FILE, 'w') as file:
-            json.dump(user_data, file, indent=4)
-    except Exception as e:
-        print(f"Erro ao salvar dados do usuário: {e}")
-        raise e
+    user_store.save_all(user_data)
+    policy_generation.bump()
@@ -0,0 +1,147 @@
+import sys
+from datetime import datetime, timedelta
+from functools import lru_cache
+from core.permissions import PERMISSION_BITS, permissions_to_mask, mask_to_permissions
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+SECURITY_KEYS = ("failed_attempts", "is_locked", "lock_time", "lock_until")
+NO_NOTES = ()
+SEXAGESIMAL = frozenset(f"{value:02d}" for value in range(60))
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self):
+        return "MISSING"
+
+MISSING = _Missing()
+
+@lru_cache(maxsize=8192)
+def _hour_epoch(prefix):
+    try:
+        moment = datetime.fromisoformat(prefix + ":00:00")
+    except ValueError:
+        return None
+    epoch = int(moment.timestamp())
+    if epoch % 60 or moment.strftime("%Y-%m-%d %H") != prefix:
+        return None
+    if datetime.fromtimestamp(epoch) != moment or datetime.fromtimestamp(epoch + 3599) != moment + timedelta(seconds=3599):
+        return None
+    return epoch
+
+@lru_cache(maxsize=8192)
+def _minute_text(minute):
+    return datetime.fromtimestamp(minute * 60).strftime("%Y-%m-%d %H:%M")
+
+def _pack_time(value):
+    if value is None or value == "":
+        return value
+    if not isinstance(value, str) or len(value) != 19 or value[13] != ":" or value[16] != ":":
+        return MISSING
+    minutes, seconds = value[14:16], value[17:19]
+    if minutes not in SEXAGESIMAL or seconds not in SEXAGESIMAL:
+        return MISSING
+    base = _hour_epoch(value[:13])
+    if base is None:
+        return MISSING
+    return base + int(minutes) * 60 + int(seconds)
+
+def _unpack_time(value):
+    if isinstance(value, int):
+        return f"{_minute_text(value // 60)}:{value % 60:02d}"
+    return value
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+class UserRecord:
+    __slots__ = (
+        "username", "created_at", "last_login", "login_count", "notes", "theme",
+        "failed_attempts", "is_locked", "lock_time", "lock_until", "mask", "extra"
+    )
+
+    def __init__(self, username):
+        self.username = sys.intern(username)
+        self.created_at = MISSING
+        self.last_login = MISSING
+        self.login_count = MISSING
+        self.notes = MISSING
+        self.theme = MISSING
+        self.failed_attempts = MISSING
+        self.is_locked = MISSING
+        self.lock_time = MISSING
+        self.lock_until = MISSING
+        self.mask = MISSING
+        self.extra = None
+
+    def _keep(self, key, value):
+        if self.extra is None:
+            self.extra = {}
+        self.extra[key] = value
+
+    def _pack_security(self, security):
+        if not isinstance(security, dict) or not set(security) <= set(SECURITY_KEYS):
+            return False
+        attempts = security.get("failed_attempts", MISSING)
+        locked = security.get("is_locked", MISSING)
+        lock_time = _pack_time(security["lock_time"]) if "lock_time" in security else None
+        lock_until = security.get("lock_until")
+        if not _is_int(attempts) or not isinstance(locked, bool) or lock_time is MISSING:
+            return False
+        if lock_until is not None and not _is_int(lock_until):
+            return False
+        self.failed_attempts = attempts
+        self.is_locked = locked
+        self.lock_time = lock_time if "lock_time" in security else MISSING
+        self.lock_until = lock_until if "lock_until" in security else MISSING
+        return True
+
+    @classmethod
+    def from_dict(cls, username, data):
+        record = cls(username)
+        for key, value in data.items():
+            if key in ("created_at", "last_login"):
+                packed = _pack_time(value)
+                if packed is MISSING:
+                    record._keep(key, value)
+                else:
+                    setattr(record, key, packed)
+            elif key == "login_count" and _is_int(value):
+                record.login_count = value
+            elif key == "notes" and isinstance(value, list):
+                record.notes = tuple(value) if value else NO_NOTES
+            elif key == "settings" and isinstance(value, dict) and list(value) == ["theme"] and isinstance(value["theme"], str):
+                record.theme = sys.intern(value["theme"])
+            elif key == "security" and record._pack_security(value):
+                pass
+            elif (key == "permissions" and isinstance(value, dict) and set(value) == set(PERMISSION_BITS)
+                  and all(isinstance(flag, bool) for flag in value.values())):
+                record.mask = permissions_to_mask(value)
+            else:
+                record._keep(key, value)
+        return record
+
+    def to_dict(self):
+        data = {}
+        if self.created_at is not MISSING:
+            data["created_at"] = _unpack_time(self.created_at)
+        if self.last_login is not MISSING:
+            data["last_login"] = _unpack_time(self.last_login)
+        if self.login_count is not MISSING:
+            data["login_count"] = self.login_count
+        if self.notes is not MISSING:
+            data["notes"] = list(self.notes)
+        if self.theme is not MISSING:
+            data["settings"] = {"theme": self.theme}
+        if self.failed_attempts is not MISSING:
+            security = {"failed_attempts": self.failed_attempts, "is_locked": self.is_locked}
+            if self.lock_time is not MISSING:
+                security["lock_time"] = _unpack_time(self.lock_time)
+            if self.lock_until is not MISSING:
+                security["lock_until"] = self.lock_until
+            data["security"] = security
+        if self.mask is not MISSING:
+            data["permissions"] = mask_to_permissions(self.mask)
+        if self.extra:
+            data.update(self.extra)
+        return data
@@ -1,11 +1,11 @@
 import tkinter as tk
-from tkinter import messagebox
-from core.auth import authenticate_user, register_user
-from core.credentials import load_credentials
-from core.user_data import load_user_data
-from constants import AUTH_LOCKED, AUTH_NOT_FOUND, AUTH_SUCCESS, AUTH_WRONG_PASSWORD, LOCK_DURATION_MINUTES
+from tkinter import ttk, messagebox
+from core.security import login_limiter
+from constants import AUTH_LOCKED, AUTH_NOT_FOUND, AUTH_SUCCESS, AUTH_WRONG_PASSWORD, AUTH_MIGRATION_REQUIRED, LOCK_DURATION_MINUTES
 from datetime import datetime, timedelta
 from gui.dashboard_screen import DashboardScreen, center_window
+from gui.auth_service import AuthService
+from core.session import Session
 
 class AuthScreen:
     def __init__(self, root, title_font, normal_font, button_font):
@@ -14,8 +14,11 @@ class AuthScreen:
         self.normal_font = normal_font
         self.button_font = button_font
         self.current_user = None
+        self.session = None
         
         self.dashboard = None
+        self.auth_service = AuthService(root)
+        self.busy_buttons = []
         
         self.show_main_menu()
 
@@ -79,10 +82,15 @@ class AuthScreen:
         button_frame = tk.Frame(frame, bg="#f0f0f0")
         button_frame.pack(pady=20)
 
-        tk.Button(button_frame, text="Registrar", font=self.button_font, bg="#4CAF50", fg="white",
-                  command=self.register_user_action).pack(side=tk.LEFT, padx=10)
-        tk.Button(button_frame, text="Voltar", font=self.button_font, bg="#f44336", fg="white",
-                  command=self.show_main_menu).pack(side=tk.LEFT, padx=10)
+        register_button = tk.Button(button_frame, text="Registrar", font=self.button_font, bg="#4CAF50", fg="white",
+                  command=self.register_user_action)
+        register_button.pack(side=tk.LEFT, padx=10)
+        back_button = tk.Button(button_frame, text="Voltar", font=self.button_font, bg="#f44336", fg="white",
+                  command=self.show_main_menu)
+        back_button.pack(side=tk.LEFT, padx=10)
+
+        self.busy_buttons = [register_button, back_button]
+        self._build_progress(frame)
 
     def show_login_screen(self):
         self.clear_screen()
@@ -108,10 +116,37 @@ class AuthScreen:
         button_frame = tk.Frame(frame, bg="#f0f0f0")
         button_frame.pack(pady=20)
 
-        tk.Button(button_frame, text="Login", font=self.button_font, bg="#2196F3", fg="white",
-                  command=self.login_user_action).pack(side=tk.LEFT, padx=10)
-        tk.Button(button_frame, text="Voltar", font=self.button_font, bg="#f44336", fg="white",
-                  command=self.show_main_menu).pack(side=tk.LEFT, padx=10)
+        login_button = tk.Button(button_frame, text="Login", font=self.button_font, bg="#2196F3", fg="white",
+                  command=self.login_user_action)
+        login_button.pack(side=tk.LEFT, padx=10)
+        back_button = tk.Button(button_frame, text="Voltar", font=self.button_font, bg="#f44336", fg="white",
+                  command=self.show_main_menu)
+        back_button.pack(side=tk.LEFT, padx=10)
+
+        self.busy_buttons = [login_button, back_button]
+        self._build_progress(frame)
+
+    def _build_progress(self, parent):
+        self.progress_label = tk.Label(parent, text="", font=self.normal_font, bg="#f0f0f0", fg="#555555")
+        self.progress_label.pack()
+        self.progress_bar = ttk.Progressbar(parent, mode="indeterminate", length=200)
+
+    def _set_busy(self, message):
+        for button in self.busy_buttons:
+            button.config(state=tk.DISABLED)
+        self.progress_label.config(text=message)
+        self.progress_bar.pack(pady=5)
+        self.progress_bar.start(10)
+
+    def _clear_busy(self):
+        try:
+            for button in self.busy_buttons:
+                button.config(state=tk.NORMAL)
+            self.progress_bar.stop()
+            self.progress_bar.pack_forget()
+            self.progress_label.config(text="")
+        except tk.TclError:
+            pass
 
     def register_user_action(self):
         username = self.username_entry.get().strip()
@@ -130,7 +165,11 @@ class AuthScreen:
             "remocao": self.var_remocao.get()
         }
 
-        success, message = register_user(username, password, permissions)
+        self._set_busy("Registrando usuário...")
+        self.auth_service.register(username, password, permissions, self._on_register_result)
+
+    def _on_register_result(self, success, message):
+        self._clear_busy()
         if success:
             messagebox.showinfo("Sucesso", message)
             self.show_main_menu()
@@ -145,32 +184,41 @@ class AuthScreen:
             messagebox.showerror("Erro", "Por favor, preencha todos os campos")
             return
 
-        credentials = load_credentials()
-        success, message = authenticate_user(username, password)
+        self._set_busy("Verificando credenciais...")
+        self.auth_service.authenticate(
+            username, password,
+            lambda success, message: self._on_login_result(username, success, message)
+        )
 
+    def _on_login_result(self, username, success, message):
+        self._clear_busy()
         if success:
             self.current_user = username
             self.show_dashboard(username)
         else:
             if message == AUTH_LOCKED:
-                user_data = load_user_data()
-                lock_time_str = user_data[username]["security"]["lock_time"]
-                lock_time = datetime.strptime(lock_time_str, "%Y-%m-%d %H:%M:%S")
-                unlock_time = lock_time + timedelta(minutes=LOCK_DURATION_MINUTES)
+                locked_until = login_limiter.locked_until(username)
+                if locked_until is not None:
+                    unlock_time = datetime.fromtimestamp(locked_until)
+                else:
+                    unlock_time = datetime.now() + timedelta(minutes=LOCK_DURATION_MINUTES)
                 unlock_time_str = unlock_time.strftime("%H:%M:%S")
                 messagebox.showerror("Conta Bloqueada", f"Esta conta foi bloqueada devido a várias tentativas falhas de login.\n\nA conta será desbloqueada automaticamente às {unlock_time_str}.\nEntre em contato com o administrador, se necessário.")
             elif message.startswith(AUTH_WRONG_PASSWORD):
                 remaining = message.split(":")[1]
                 messagebox.showerror("Erro", f"Senha incorreta. Tentativas restantes: {remaining}")
-            elif message == AUTH_NOT_FOUND and username not in credentials:
+            elif message == AUTH_NOT_FOUND:
                 response = messagebox.askquestion("Usuário não encontrado", "Usuário não existe. Deseja criar uma conta?")
                 if response == 'yes':
                     self.show_register_screen()
+            elif message == AUTH_MIGRATION_REQUIRED:
+                messagebox.showerror("Credencial Desatualizada", "A senha desta conta ainda está em um formato antigo e precisa ser migrada.\n\nPeça ao administrador para executar a migração de credenciais.")
             else:
                 messagebox.showerror("Erro", "Erro de autenticação desconhecido.")
                 
     def show_dashboard(self, username):
         self.current_user = username
+        self.session = Session(username)
         self.root.title(f"Dashboard - {username}")
         
         if self.dashboard is None:
@@ -179,10 +227,11 @@ class AuthScreen:
                 self.title_font, 
                 self.normal_font, 
                 self.button_font, 
-                username, 
+                self.session, 
                 self
             )
         else:
+            self.dashboard.session = self.session
             self.dashboard.username = username
         
         self.dashboard.show_dashboard()
@@ -190,4 +239,5 @@ class AuthScreen:
     def logout(self):
         if messagebox.askyesno("Logout", "Deseja realmente sair da sua conta?"):
             self.current_user = None
+            self.session = None
             self.show_main_menu()
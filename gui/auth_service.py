@@ -0,0 +1,38 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from core.auth import authenticate_user, register_user
+from utils.logger import get_logger, log_event
+
+logger = get_logger("auth")
+
+class AuthService:
+    def __init__(self, root, max_workers=2, poll_interval=30):
+        self.root = root
+        self.poll_interval = poll_interval
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="auth")
+
+    def submit(self, callback, func, *args):
+        future = self.executor.submit(func, *args)
+        self._poll(future, callback)
+        return future
+
+    def _poll(self, future, callback):
+        if not future.done():
+            self.root.after(self.poll_interval, self._poll, future, callback)
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            message = f"Falha no serviço de autenticação: {e}"
+            log_event(logger, "auth_service_error", message, logging.ERROR)
+            result = (False, message)
+        callback(*result)
+
+    def authenticate(self, username, password, callback):
+        return self.submit(callback, authenticate_user, username, password)
+
+    def register(self, username, password, permissions, callback):
+        return self.submit(callback, register_user, username, password, permissions)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
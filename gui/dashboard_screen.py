@@ -1,15 +1,17 @@
-import os
 import tkinter as tk
 from tkinter import font, ttk, messagebox, scrolledtext, simpledialog
 from datetime import datetime
 
-from core.file_manager import FileManager
-from core.user_data import load_user_data
+from core.file_manager import FileManager, FILE_TYPE_LABELS, SORT_KEYS
+from core.permissions import PERM_READ, PERM_WRITE, PERM_DELETE, policy_generation
 
+from gui.file_list_view import VirtualFileList
 from gui.editors.file_editor import open_file_editor
 from gui.editors.draw_editor import open_draw_editor
 from gui.editors.sheet_editor import open_sheet_editor
 
+ALL_TYPES_LABEL = "Todos os tipos"
+
 def center_window(window, width=None, height=None):
     if width is None:
         width = window.winfo_width()
@@ -27,14 +29,16 @@ def center_window(window, width=None, height=None):
     window.geometry(f"{width}x{height}+{x}+{y}")
 
 class DashboardScreen:
-    def __init__(self, root, title_font, normal_font, button_font, username, controller):
+    def __init__(self, root, title_font, normal_font, button_font, session, controller):
         self.root = root
         self.title_font = title_font
         self.normal_font = normal_font
         self.button_font = button_font
-        self.username = username
+        self.session = session
+        self.username = session.username
         self.controller = controller
         self.file_manager = FileManager()
+        self._action_labels = {}
         self.status_label = None
         
     def show_dashboard(self):
@@ -85,7 +89,7 @@ class DashboardScreen:
                  font=font.Font(family="Arial", size=12, weight="bold"),
                  fg="white", bg="#34495e").pack(pady=(20, 10), padx=10, anchor='w')
 
-        user_info = load_user_data().get(self.username, {})
+        user_info = self.session.user_info
 
         info_frame = tk.Frame(sidebar, bg="#34495e", padx=10, pady=5)
         info_frame.pack(fill=tk.X)
@@ -93,6 +97,7 @@ class DashboardScreen:
         self.create_info_label(info_frame, "Último login:", user_info.get("last_login", "Primeiro acesso"))
         self.create_info_label(info_frame, "Total de logins:", str(user_info.get("login_count", "1")))
         self.create_info_label(info_frame, "Conta criada em:", user_info.get("created_at", "Desconhecido"))
+        self.create_info_label(info_frame, "Papéis:", ", ".join(self.session.roles) or "Nenhum")
 
         ttk.Separator(sidebar, orient='horizontal').pack(fill=tk.X, pady=10)
 
@@ -100,7 +105,7 @@ class DashboardScreen:
                  font=font.Font(family="Arial", size=12, weight="bold"),
                  fg="white", bg="#34495e").pack(pady=(10, 5), padx=10, anchor='w')
 
-        permissions = user_info.get("permissions", {})
+        permissions = self.session.permissions
         self.create_permission_label(sidebar, "Leitura", permissions.get("leitura", False))
         self.create_permission_label(sidebar, "Escrita", permissions.get("escrita", False))
         self.create_permission_label(sidebar, "Remoção", permissions.get("remocao", False))
@@ -116,10 +121,7 @@ class DashboardScreen:
                  font=font.Font(family="Arial", size=12, weight="bold"),
                  bg="#ecf0f1").pack(side=tk.LEFT)
 
-        user_data = load_user_data()
-        permissions = user_data[self.username].get("permissions", {})
-
-        if permissions.get("escrita"):
+        if self.session.can(PERM_WRITE):
             create_button = tk.Menubutton(
                 actions_frame, 
                 text="Novo Arquivo", 
@@ -139,7 +141,7 @@ class DashboardScreen:
             tk.Button(actions_frame, text="Novo Arquivo", state=tk.DISABLED,
                      bg="#2ecc71", fg="white", padx=10).pack(side=tk.RIGHT, padx=5)
 
-        if permissions.get("remocao"):
+        if self.session.can(PERM_DELETE):
             tk.Button(actions_frame, text="Excluir Arquivo", command=self.remove_selected_file,
                     bg="#e74c3c", fg="white", padx=10).pack(side=tk.RIGHT, padx=5)
         
@@ -149,26 +151,41 @@ class DashboardScreen:
         files_container = tk.Frame(main_panel, bg="white", padx=10, pady=10)
         files_container.pack(fill=tk.BOTH, expand=True)
 
-        columns = ("nome", "tipo", "tamanho", "modificado", "permissoes")
-        self.file_tree = ttk.Treeview(files_container, columns=columns, show="headings", selectmode="browse")
-
-        self.file_tree.heading("nome", text="Nome do Arquivo")
-        self.file_tree.heading("tipo", text="Tipo")
-        self.file_tree.heading("tamanho", text="Tamanho")
-        self.file_tree.heading("modificado", text="Última Modificação")
-        self.file_tree.heading("permissoes", text="Ações")
-
-        self.file_tree.column("nome", width=200, anchor='w')
-        self.file_tree.column("tipo", width=80, anchor='center')
-        self.file_tree.column("tamanho", width=80, anchor='center')
-        self.file_tree.column("modificado", width=150, anchor='center')
-        self.file_tree.column("permissoes", width=150, anchor='center')
-
-        scrollbar = ttk.Scrollbar(files_container, orient="vertical", command=self.file_tree.yview)
-        self.file_tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.file_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        self.file_tree.bind("<Double-1>", lambda e: self.open_selected_file())
+        filter_frame = tk.Frame(files_container, bg="white")
+        filter_frame.pack(fill=tk.X, pady=(0, 5))
+
+        tk.Label(filter_frame, text="Filtrar:", bg="white").pack(side=tk.LEFT)
+        self.filter_var = tk.StringVar()
+        filter_entry = tk.Entry(filter_frame, textvariable=self.filter_var, width=30)
+        filter_entry.pack(side=tk.LEFT, padx=5)
+        filter_entry.bind("<KeyRelease>", lambda e: self.apply_file_filter())
+
+        self.type_filter_var = tk.StringVar(value=ALL_TYPES_LABEL)
+        type_filter = ttk.Combobox(filter_frame, textvariable=self.type_filter_var, state="readonly", width=14,
+                                   values=[ALL_TYPES_LABEL] + list(FILE_TYPE_LABELS.values()))
+        type_filter.pack(side=tk.LEFT, padx=5)
+        type_filter.bind("<<ComboboxSelected>>", lambda e: self.apply_file_filter())
+
+        self.file_list = VirtualFileList(
+            files_container,
+            columns=(
+                ("nome", "Nome do Arquivo", 200, 'w'),
+                ("tipo", "Tipo", 80, 'center'),
+                ("tamanho", "Tamanho", 80, 'center'),
+                ("modificado", "Última Modificação", 150, 'center'),
+                ("permissoes", "Ações", 150, 'center')
+            ),
+            sort_keys={
+                "nome": SORT_KEYS["name"],
+                "tipo": SORT_KEYS["type"],
+                "tamanho": SORT_KEYS["size"],
+                "modificado": SORT_KEYS["mtime"]
+            },
+            format_rows=self._format_rows,
+            on_open=self.open_selected_file
+        )
+        self.file_list.sort_by("nome")
+        self.file_list.pack(fill=tk.BOTH, expand=True)
 
     def _build_status_bar(self, parent):
         status = tk.Frame(parent, bg="#7f8c8d", height=25)
@@ -199,50 +216,51 @@ class DashboardScreen:
         tk.Label(frame, text=status_text, font=font.Font(family="Arial", size=9, weight="bold"),
                 fg=status_color, bg="#34495e", width=2).pack(side=tk.RIGHT)
 
+    def _action_label(self, mask):
+        label = self._action_labels.get(mask)
+        if label is None:
+            actions = []
+            if mask & PERM_READ: actions.append("Ler")
+            if mask & PERM_WRITE: actions.append("Editar")
+            if mask & PERM_DELETE: actions.append("Remover")
+            label = self._action_labels[mask] = ", ".join(actions) if actions else "Sem permissões"
+        return label
+
+    def _format_rows(self, entries):
+        masks = self.session.evaluate_many([entry.name for entry in entries], PERM_READ | PERM_WRITE | PERM_DELETE)
+        return [
+            (
+                entry.name,
+                FILE_TYPE_LABELS[entry.type],
+                self._format_size(entry.size),
+                datetime.fromtimestamp(entry.mtime_ns / 1e9).strftime('%d/%m/%Y %H:%M'),
+                self._action_label(mask)
+            )
+            for entry, mask in zip(entries, masks)
+        ]
+
+    def _update_status(self):
+        if self.status_label and self.status_label.winfo_exists():
+            total = self.file_list.total()
+            shown = self.file_list.shown()
+            text = f"{total} arquivo(s) encontrado(s) no sistema"
+            if shown != total:
+                text += f" ({shown} exibido(s) pelo filtro)"
+            self.status_label.config(text=text)
+
+    def apply_file_filter(self):
+        label = self.type_filter_var.get()
+        file_type = next((key for key, value in FILE_TYPE_LABELS.items() if value == label), None)
+        self.file_list.set_filter(self.filter_var.get(), file_type)
+        self._update_status()
+
     def refresh_file_list(self):
         try:
-            if not hasattr(self, 'file_tree') or not self.file_tree.winfo_exists():
+            if not hasattr(self, 'file_list') or not self.file_list.winfo_exists():
                 return
-                
-            for i in self.file_tree.get_children():
-                self.file_tree.delete(i)
-
-            files = self.file_manager.list_files()
-            file_count = len(files) if files else 0
-            
-            user_data = load_user_data()
-            permissions = user_data[self.username].get("permissions", {})
-            can_read = permissions.get("leitura")
-            can_write = permissions.get("escrita")
-            can_delete = permissions.get("remocao")
-
-            for file in files:
-                try:
-                    path = os.path.join(self.file_manager.folder, file)
-                    size = self._format_size(os.path.getsize(path))
-                    mod_time = datetime.fromtimestamp(os.path.getmtime(path)).strftime('%d/%m/%Y %H:%M')
-                    
-                    if file.endswith('.txt'):
-                        file_type = "Texto"
-                    elif file.endswith('.draw'):
-                        file_type = "Desenho"
-                    elif file.endswith('.sheet'):
-                        file_type = "Planilha"
-                    else:
-                        file_type = "Desconhecido"
-                    
-                    actions = []
-                    if can_read: actions.append("Ler")
-                    if can_write: actions.append("Editar")
-                    if can_delete: actions.append("Remover")
-                    actions_str = ", ".join(actions) if actions else "Sem permissões"
-                    
-                    self.file_tree.insert("", tk.END, values=(file, file_type, size, mod_time, actions_str))
-                except Exception as e:
-                    print(f"Erro ao processar arquivo {file}: {e}")
 
-            if self.status_label and self.status_label.winfo_exists():
-                self.status_label.config(text=f"{file_count} arquivo(s) encontrado(s) no sistema")
+            self.file_list.set_entries(self.file_manager.list_entries(), policy_generation.current())
+            self._update_status()
         except tk.TclError as e:
             print(f"[Aviso] Erro ao atualizar lista de arquivos: {e}")
         except Exception as e:
@@ -267,8 +285,7 @@ class DashboardScreen:
             return f"{size/(1024**3):.1f} GB"
 
     def create_new_file(self, default_extension=".txt"):
-        user_data = load_user_data()
-        if not user_data[self.username]["permissions"].get("escrita"):
+        if not self.session.require(PERM_WRITE):
             messagebox.showerror("Sem permissão", "Você não tem permissão para criar arquivos.")
             return
 
@@ -288,12 +305,14 @@ class DashboardScreen:
                                                  filename.endswith(".sheet")):
             filename += ".txt"
 
-        if filename in self.file_manager.list_files():
-            result, msg = self.file_manager.read_file(filename)
-            if result:
-                content = msg
-            else:
-                content = ""
+        if self.file_manager.exists(filename):
+            if not self.session.require(PERM_READ, filename):
+                messagebox.showerror("Sem permissão", f"O arquivo '{filename}' já existe e você não tem permissão para lê-lo.")
+                return
+            result, content = self.file_manager.read_file(filename, user=self.session.username)
+            if not result:
+                messagebox.showerror("Erro", f"Não foi possível abrir o arquivo: {content}")
+                return
         else:
             if filename.endswith(".draw"):
                 content = '{"strokes": [], "current_stroke": []}'
@@ -302,7 +321,7 @@ class DashboardScreen:
             else:
                 content = ""
                 
-            result, msg = self.file_manager.create_file(filename, content)
+            result, msg = self.file_manager.create_file(filename, content, user=self.session.username)
             if not result:
                 messagebox.showerror("Erro", f"Não foi possível criar o arquivo: {msg}")
                 return
@@ -317,34 +336,31 @@ class DashboardScreen:
         
         if filename.endswith(".draw"):
             open_draw_editor(
-                self.root, main_frame, self.file_manager, self.username,
+                self.root, main_frame, self.file_manager, self.session,
                 filename, content, self.show_dashboard, self.safe_refresh_file_list
             )
         elif filename.endswith(".sheet"):
             open_sheet_editor(
-                self.root, main_frame, self.file_manager, self.username,
+                self.root, main_frame, self.file_manager, self.session,
                 filename, content, self.show_dashboard, self.safe_refresh_file_list
             )
         else:
             open_file_editor(
-                self.root, main_frame, self.file_manager, self.username,
+                self.root, main_frame, self.file_manager, self.session,
                 filename, content, self.show_dashboard, self.safe_refresh_file_list
             )
 
     def open_selected_file(self):
-        selection = self.file_tree.selection()
-        if not selection:
+        filename = self.file_list.selected_name()
+        if not filename:
             messagebox.showinfo("Selecione um arquivo", "Por favor, selecione um arquivo para abrir.")
             return
 
-        filename = self.file_tree.item(selection[0], "values")[0]
-        user_data = load_user_data()
-
-        if not user_data[self.username]["permissions"].get("leitura"):
+        if not self.session.require(PERM_READ, filename):
             messagebox.showerror("Sem permissão", "Você não tem permissão para ler arquivos.")
             return
 
-        success, content = self.file_manager.read_file(filename)
+        success, content = self.file_manager.read_file(filename, user=self.session.username)
         if success:
             for widget in self.root.winfo_children():
                 widget.destroy()
@@ -356,32 +372,29 @@ class DashboardScreen:
             
             if filename.endswith(".draw"):
                 open_draw_editor(
-                    self.root, main_frame, self.file_manager, self.username,
+                    self.root, main_frame, self.file_manager, self.session,
                     filename, content, self.show_dashboard, self.safe_refresh_file_list
                 )
             elif filename.endswith(".sheet"):
                 open_sheet_editor(
-                    self.root, main_frame, self.file_manager, self.username,
+                    self.root, main_frame, self.file_manager, self.session,
                     filename, content, self.show_dashboard, self.safe_refresh_file_list
                 )
             else:
                 open_file_editor(
-                    self.root, main_frame, self.file_manager, self.username,
+                    self.root, main_frame, self.file_manager, self.session,
                     filename, content, self.show_dashboard, self.safe_refresh_file_list
                 )
         else:
             messagebox.showerror("Erro", f"Erro ao abrir arquivo: {content}")
             
     def remove_selected_file(self):
-        selection = self.file_tree.selection()
-        if not selection:
+        filename = self.file_list.selected_name()
+        if not filename:
             messagebox.showinfo("Selecione um arquivo", "Por favor, selecione um arquivo para remover.")
             return
-            
-        filename = self.file_tree.item(selection[0], "values")[0]
-        
-        user_data = load_user_data()
-        if not user_data[self.username]["permissions"].get("remocao"):
+                    
+        if not self.session.require(PERM_DELETE, filename):
             messagebox.showerror("Sem permissão", "Você não tem permissão para remover arquivos.")
             return
             
@@ -390,7 +403,7 @@ class DashboardScreen:
         if not confirm:
             return
             
-        success, message = self.file_manager.remove_file(filename)
+        success, message = self.file_manager.remove_file(filename, user=self.session.username)
         if success:
             messagebox.showinfo("Sucesso", message)
             self.safe_refresh_file_list()
@@ -1,17 +1,16 @@
 import tkinter as tk
 import json
 from tkinter import messagebox, simpledialog
-from core.user_data import load_user_data
+from core.permissions import PERM_WRITE
 
-def open_draw_editor(root, parent_frame, file_manager, current_user, filename, content, 
+def open_draw_editor(root, parent_frame, file_manager, session, filename, content, 
                      return_callback=None, refresh_callback=None):
     for widget in parent_frame.winfo_children():
         widget.destroy()
     
     root.title(f"Editor de Desenho - {filename}")
     
-    user_data = load_user_data()
-    can_write = user_data[current_user]["permissions"].get("escrita", False)
+    can_write = session.can(PERM_WRITE, filename)
     read_only = not can_write
     
     editor_frame = tk.Frame(parent_frame, bg="#f5f5f5")
@@ -188,17 +187,17 @@ def open_draw_editor(root, parent_frame, file_manager, current_user, filename, c
     ).pack(side=tk.LEFT, padx=5)
     
     def save_drawing():
-        if not can_write:
+        if not session.require(PERM_WRITE, filename):
             messagebox.showerror("Sem permissão", "Você não tem permissão para salvar desenhos.")
             return
         
         try:
             drawing_json = json.dumps(draw_data, indent=2)
             
-            if filename in file_manager.list_files():
-                result, msg = file_manager.edit_file(filename, drawing_json)
+            if file_manager.exists(filename):
+                result, msg = file_manager.edit_file(filename, drawing_json, user=session.username)
             else:
-                result, msg = file_manager.create_file(filename, drawing_json)
+                result, msg = file_manager.create_file(filename, drawing_json, user=session.username)
                 
             if result:
                 messagebox.showinfo("Sucesso", msg)
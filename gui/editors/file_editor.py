@@ -1,16 +1,15 @@
 import tkinter as tk
 from tkinter import scrolledtext, messagebox
-from core.user_data import load_user_data
+from core.permissions import PERM_WRITE
 
-def open_file_editor(root, parent_frame, file_manager, current_user, filename, content, 
+def open_file_editor(root, parent_frame, file_manager, session, filename, content, 
                     return_callback=None, refresh_callback=None):
     for widget in parent_frame.winfo_children():
         widget.destroy()
     
     root.title(f"Editor - {filename}")
     
-    user_data = load_user_data()
-    can_write = user_data[current_user]["permissions"].get("escrita", False)
+    can_write = session.can(PERM_WRITE, filename)
     read_only = not can_write
     
     editor_frame = tk.Frame(parent_frame, bg="#f5f5f5")
@@ -58,14 +57,14 @@ def open_file_editor(root, parent_frame, file_manager, current_user, filename, c
         text_editor.config(state=tk.DISABLED)
     
     def save():
-        if not can_write:
+        if not session.require(PERM_WRITE, filename):
             messagebox.showerror("Sem permissão", "Você não tem permissão para salvar arquivos.")
             return
         
-        if filename in file_manager.list_files():
-            result, msg = file_manager.edit_file(filename, text_editor.get("1.0", tk.END))
+        if file_manager.exists(filename):
+            result, msg = file_manager.edit_file(filename, text_editor.get("1.0", tk.END), user=session.username)
         else:
-            result, msg = file_manager.create_file(filename, text_editor.get("1.0", tk.END))
+            result, msg = file_manager.create_file(filename, text_editor.get("1.0", tk.END), user=session.username)
             
         if result:
             messagebox.showinfo("Sucesso", msg)
@@ -1,17 +1,16 @@
 import tkinter as tk
 import json
 from tkinter import ttk, messagebox, simpledialog
-from core.user_data import load_user_data
+from core.permissions import PERM_WRITE
 
-def open_sheet_editor(root, parent_frame, file_manager, current_user, filename, content, 
+def open_sheet_editor(root, parent_frame, file_manager, session, filename, content, 
                      return_callback=None, refresh_callback=None):
     for widget in parent_frame.winfo_children():
         widget.destroy()
     
     root.title(f"Editor de Planilha - {filename}")
     
-    user_data = load_user_data()
-    can_write = user_data[current_user]["permissions"].get("escrita", False)
+    can_write = session.can(PERM_WRITE, filename)
     read_only = not can_write
     
     editor_frame = tk.Frame(parent_frame, bg="#f5f5f5")
@@ -162,17 +161,17 @@ def open_sheet_editor(root, parent_frame, file_manager, current_user, filename,
     actions_frame.pack(fill=tk.X)
     
     def save_sheet():
-        if not can_write:
+        if not session.require(PERM_WRITE, filename):
             messagebox.showerror("Sem permissão", "Você não tem permissão para salvar planilhas.")
             return
         
         try:
             sheet_json = json.dumps(sheet_data, indent=2)
             
-            if filename in file_manager.list_files():
-                result, msg = file_manager.edit_file(filename, sheet_json)
+            if file_manager.exists(filename):
+                result, msg = file_manager.edit_file(filename, sheet_json, user=session.username)
             else:
-                result, msg = file_manager.create_file(filename, sheet_json)
+                result, msg = file_manager.create_file(filename, sheet_json, user=session.username)
                 
             if result:
                 messagebox.showinfo("Sucesso", msg)
@@ -0,0 +1,296 @@
+import tkinter as tk
+from tkinter import ttk
+
+class FileListModel:
+    def __init__(self, sort_keys, format_rows, buffer_rows=50):
+        self.sort_keys = sort_keys
+        self.format_rows = format_rows
+        self.buffer_rows = buffer_rows
+        self.entries = []
+        self.view = []
+        self.offset = 0
+        self.rows = 20
+        self.sort_column = None
+        self.sort_reverse = False
+        self.filter_text = ""
+        self.filter_type = None
+        self._cache = {}
+        self._positions = None
+        self._by_name = {}
+        self._generation = None
+
+    def set_entries(self, entries, generation=None):
+        entries = list(entries)
+        if generation != self._generation:
+            self._cache = {}
+            self._generation = generation
+        current = {entry.name: entry for entry in entries}
+        previous = self._by_name
+        removed = [entry for name, entry in previous.items() if current.get(name) != entry]
+        added = [entry for name, entry in current.items() if previous.get(name) != entry]
+        for entry in removed:
+            self._cache.pop(entry.name, None)
+        self.entries = entries
+        self._by_name = current
+        if self.sort_column is None or len(removed) + len(added) > len(self.view) // 2:
+            self._rebuild()
+        elif removed or added:
+            self._patch(removed, added)
+
+    def set_filter(self, text="", file_type=None):
+        self.filter_text = text
+        self.filter_type = file_type
+        self._rebuild()
+
+    def sort_by(self, column):
+        if column == self.sort_column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column = column
+            self.sort_reverse = False
+        self._rebuild()
+
+    def _matches(self, entry, text):
+        if self.filter_type is not None and entry.type != self.filter_type:
+            return False
+        return not text or text in entry.name.casefold()
+
+    def _rebuild(self):
+        text = self.filter_text.casefold()
+        if text or self.filter_type is not None:
+            view = [entry for entry in self.entries if self._matches(entry, text)]
+        else:
+            view = list(self.entries)
+        if self.sort_column is not None:
+            view.sort(key=self._order_key, reverse=self.sort_reverse)
+        self.view = view
+        self._positions = None
+        self.offset = self.clamp(self.offset)
+
+    def _order_key(self, entry):
+        return self.sort_keys[self.sort_column](entry), entry.name
+
+    def _locate(self, entry):
+        key = self._order_key(entry)
+        low, high = 0, len(self.view)
+        while low < high:
+            middle = (low + high) // 2
+            current = self._order_key(self.view[middle])
+            if (current > key) if self.sort_reverse else (current < key):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _patch(self, removed, added):
+        anchor = self.view[self.offset] if 0 < self.offset < len(self.view) else None
+        for entry in removed:
+            index = self._locate(entry)
+            if index < len(self.view) and self.view[index].name == entry.name:
+                del self.view[index]
+        text = self.filter_text.casefold()
+        for entry in added:
+            if self._matches(entry, text):
+                self.view.insert(self._locate(entry), entry)
+        self._positions = None
+        if anchor is not None and self._by_name.get(anchor.name) == anchor:
+            self.offset = self._locate(anchor)
+        self.offset = self.clamp(self.offset)
+
+    def clamp(self, offset):
+        return max(0, min(offset, len(self.view) - self.rows))
+
+    def scroll_to(self, offset):
+        self.offset = self.clamp(offset)
+        return self.offset
+
+    def index_of(self, name):
+        if self._positions is None:
+            self._positions = {entry.name: index for index, entry in enumerate(self.view)}
+        return self._positions.get(name)
+
+    def ensure_visible(self, index):
+        if index < self.offset:
+            self.scroll_to(index)
+        elif index >= self.offset + self.rows:
+            self.scroll_to(index - self.rows + 1)
+
+    def window(self):
+        end = min(len(self.view), self.offset + self.rows)
+        low = max(0, self.offset - self.buffer_rows)
+        high = min(len(self.view), end + self.buffer_rows)
+        visible = self.view[self.offset:end]
+        if any(entry.name not in self._cache for entry in visible):
+            pending = [entry for entry in self.view[low:high] if entry.name not in self._cache]
+            for entry, values in zip(pending, self.format_rows(pending)):
+                self._cache[entry.name] = values
+        if len(self._cache) > 2 * (high - low):
+            keep = {entry.name for entry in self.view[low:high]}
+            self._cache = {name: values for name, values in self._cache.items() if name in keep}
+        return [(entry, self._cache[entry.name]) for entry in visible]
+
+    def scroll_fraction(self):
+        total = len(self.view)
+        if total <= self.rows:
+            return 0.0, 1.0
+        return self.offset / total, (self.offset + self.rows) / total
+
+class VirtualFileList:
+    def __init__(self, parent, columns, sort_keys, format_rows, on_open=None, buffer_rows=50):
+        self.columns = columns
+        self.on_open = on_open
+        self.model = FileListModel(sort_keys, format_rows, buffer_rows)
+        self.selected = None
+        self.items = {}
+        self.order = []
+        self.values = {}
+        self.selected_item = None
+        self.fraction = None
+        self.row_height = int(float(ttk.Style().lookup("Treeview", "rowheight") or 20))
+
+        self.frame = tk.Frame(parent, bg="white")
+        self.tree = ttk.Treeview(self.frame, columns=[column for column, _, _, _ in columns],
+                                 show="headings", selectmode="browse")
+        for column, heading, width, anchor in columns:
+            command = (lambda name=column: self.sort_by(name)) if column in sort_keys else ""
+            self.tree.heading(column, text=heading, command=command)
+            self.tree.column(column, width=width, anchor=anchor)
+
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<Double-1>", lambda e: self.on_open() if self.on_open else None)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-3 if e.delta > 0 else 3))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+        for key, delta in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "-page"), ("<Next>", "page"),
+                           ("<Home>", "start"), ("<End>", "end")):
+            self.tree.bind(key, lambda e, step=delta: self._move_selection(step))
+
+    def pack(self, **options):
+        self.frame.pack(**options)
+
+    def winfo_exists(self):
+        return self.tree.winfo_exists()
+
+    def set_entries(self, entries, generation=None):
+        self.model.set_entries(entries, generation)
+        self.render()
+
+    def set_filter(self, text="", file_type=None):
+        self.model.set_filter(text, file_type)
+        self.render()
+
+    def sort_by(self, column):
+        self.model.sort_by(column)
+        for name, heading, _, _ in self.columns:
+            arrow = (" ▼" if self.model.sort_reverse else " ▲") if name == self.model.sort_column else ""
+            self.tree.heading(name, text=heading + arrow)
+        index = self.model.index_of(self.selected) if self.selected else None
+        if index is not None:
+            self.model.ensure_visible(index)
+        self.render()
+
+    def scroll(self, delta):
+        self.model.scroll_to(self.model.offset + delta)
+        self.render()
+        return "break"
+
+    def selected_name(self):
+        if self.selected is not None and self.model.index_of(self.selected) is not None:
+            return self.selected
+        return None
+
+    def shown(self):
+        return len(self.model.view)
+
+    def total(self):
+        return len(self.model.entries)
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.model.scroll_to(int(float(value) * len(self.model.view)))
+        elif unit == "pages":
+            self.model.scroll_to(self.model.offset + int(value) * self.model.rows)
+        else:
+            self.model.scroll_to(self.model.offset + int(value))
+        self.render()
+
+    def _on_resize(self, event):
+        rows = max(1, (event.height - self.row_height - 4) // self.row_height)
+        if rows != self.model.rows:
+            self.model.rows = rows
+            self.model.scroll_to(self.model.offset)
+            self.render()
+
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        if selection:
+            self.selected_item = selection[0]
+            self.selected = self.tree.set(selection[0], self.columns[0][0])
+
+    def _move_selection(self, step):
+        total = len(self.model.view)
+        if not total:
+            return "break"
+        current = self.model.index_of(self.selected) if self.selected else None
+        if step == "start":
+            index = 0
+        elif step == "end":
+            index = total - 1
+        elif current is None:
+            index = self.model.offset
+        elif step == "page":
+            index = current + self.model.rows
+        elif step == "-page":
+            index = current - self.model.rows
+        else:
+            index = current + step
+        index = max(0, min(index, total - 1))
+        self.selected = self.model.view[index].name
+        self.model.ensure_visible(index)
+        self.render()
+        return "break"
+
+    def render(self):
+        window = self.model.window()
+        wanted = {entry.name for entry, _ in window}
+        for name in [name for name in self.order if name not in wanted]:
+            self.tree.delete(self.items.pop(name))
+            del self.values[name]
+            if self.selected_item is not None and name == self.selected:
+                self.selected_item = None
+        order = [name for name in self.order if name in wanted]
+
+        for position, (entry, values) in enumerate(window):
+            name = entry.name
+            item = self.items.get(name)
+            if item is None:
+                item = self.items[name] = self.tree.insert("", position, values=values)
+                order.insert(position, name)
+            else:
+                if order[position] != name:
+                    self.tree.move(item, "", position)
+                    order.remove(name)
+                    order.insert(position, name)
+                if self.values[name] != values:
+                    self.tree.item(item, values=values)
+            self.values[name] = values
+        self.order = order
+
+        item = self.items.get(self.selected) if self.selected else None
+        if item != self.selected_item:
+            if item is not None:
+                self.tree.selection_set(item)
+                self.tree.focus(item)
+            elif self.tree.exists(self.selected_item):
+                self.tree.selection_remove(self.selected_item)
+            self.selected_item = item
+
+        fraction = self.model.scroll_fraction()
+        if fraction != self.fraction:
+            self.scrollbar.set(*fraction)
+            self.fraction = fraction
@@ -1,12 +1,19 @@
 import os
+import logging
 import tkinter as tk
 from tkinter import font
-from datetime import datetime
 from gui.auth_screen import AuthScreen
 from gui.styles import configure_app_style
 from constants import CREDENTIALS_FILE, USER_DATA_FILE, FILES_DATA_DIR
 from core.credentials import initialize_credentials
+from core.audit import audit_log
+from core.atomic_io import atomic_writer
+from core.permissions import decision_cache
+from core.security import security_journal, compact_security_journal, lock_scheduler, schedule_pending_unlocks
 from gui.dashboard_screen import center_window 
+from utils.logger import setup_logging, get_logger, log_event, shutdown_logging
+
+logger = get_logger("app")
 
 def ensure_directories_exist():
     directories = [
@@ -19,17 +26,21 @@ def ensure_directories_exist():
         if not os.path.exists(directory):
             try:
                 os.makedirs(directory)
-                print(f"[{datetime.now()}] Diretório criado: {directory}")
+                log_event(logger, "directory_created", f"Diretório criado: {directory}")
             except Exception as e:
-                print(f"[{datetime.now()}] Erro ao criar diretório {directory}: {str(e)}")
+                log_event(logger, "directory_error", f"Erro ao criar diretório {directory}: {str(e)}", logging.ERROR)
 
 def main():
+    setup_logging()
     try:
-        print(f"[{datetime.now()}] Iniciando aplicação...")
+        log_event(logger, "app_start", "Iniciando aplicação...")
         
         ensure_directories_exist()
         
         initialize_credentials()
+        security_journal.replay()
+        schedule_pending_unlocks()
+        lock_scheduler.start()
         
         root = tk.Tk()
         root.title("Sistema de Controle de Acesso")
@@ -46,15 +57,23 @@ def main():
         
         app = AuthScreen(root, title_font, normal_font, button_font)
         root.mainloop()
+        app.auth_service.shutdown()
 
     except Exception as e:
-        print(f"[{datetime.now()}] Erro fatal na aplicação: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Erro fatal na aplicação: {str(e)}", extra={"event": "app_fatal_error"})
         from tkinter import messagebox
         messagebox.showerror("Erro Fatal", f"Ocorreu um erro inesperado:\n{str(e)}")
     finally:
-        print(f"[{datetime.now()}] Aplicação finalizada.")
+        lock_scheduler.stop()
+        try:
+            compact_security_journal()
+        except Exception as e:
+            log_event(logger, "journal_compact_error", f"Erro ao compactar journal de segurança: {str(e)}", logging.ERROR)
+        audit_log.close()
+        log_event(logger, "atomic_writer_stats", f"Escritas atômicas: {atomic_writer.stats()}")
+        log_event(logger, "decision_cache_stats", f"Cache de decisões de permissão: {decision_cache.stats()}")
+        log_event(logger, "app_stop", "Aplicação finalizada.")
+        shutdown_logging()
 
 if __name__ == "__main__":
     main()
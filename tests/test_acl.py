@@ -0,0 +1,54 @@
+import random
+from core.acl import FileAcl, ROOT, ALL_PERMISSIONS
+from core.permissions import policy_generation
+from core.storage import JsonBackend
+
+USERS = ("alice", "bob", "carol", "dave")
+PATHS = ["a.txt", "b.draw", "c.sheet", "docs/d.txt", "docs/e.txt", "docs/old/f.txt", "tmp/g.sheet"]
+
+def make_acl():
+    return FileAcl(JsonBackend("data/acl.json"), JsonBackend("data/acl_groups.json"))
+
+def random_permissions(rng):
+    return {name: rng.random() < 0.5 for name in ("leitura", "escrita", "remocao")}
+
+def test_evaluate_many_matches_per_file_checks(workdir):
+    rng = random.Random(7)
+    acl = make_acl()
+    acl.set_group("equipe", ["bob", "carol"])
+    targets = [ROOT, "docs/", "docs/old/", "tmp/"] + PATHS
+    for _ in range(40):
+        principal = rng.choice(USERS + ("@equipe",))
+        acl.set_rule(rng.choice(targets), principal, random_permissions(rng), rng.choice(("allow", "deny")))
+    acl.set_owner("docs/e.txt", "dave")
+    acl.set_owner("a.txt", "carol")
+
+    for username in USERS + ("eve",):
+        for default_mask in range(ALL_PERMISSIONS + 1):
+            for actions in (ALL_PERMISSIONS, 1, 6):
+                expected = [acl.effective_mask(username, path, default_mask) & actions for path in PATHS]
+                assert acl.evaluate_many(username, PATHS, default_mask, actions) == expected
+
+def test_more_specific_level_wins_and_deny_beats_allow(workdir):
+    acl = make_acl()
+    acl.set_rule(ROOT, "bob", {"leitura": True, "escrita": True})
+    acl.set_rule("docs/", "bob", {"escrita": True}, "deny")
+    acl.set_rule("docs/d.txt", "bob", {"escrita": True})
+    acl.set_rule("docs/d.txt", "bob", {"escrita": True}, "deny")
+    acl.set_rule("docs/e.txt", "bob", {"escrita": True})
+    assert acl.evaluate_many("bob", ["a.txt", "docs/d.txt", "docs/e.txt"]) == [3, 1, 3]
+
+def test_index_is_only_recompiled_for_acl_changes(workdir, monkeypatch):
+    acl = make_acl()
+    other = make_acl()
+    acl.set_rule("a.txt", "bob", {"leitura": True})
+    assert acl.effective_mask("bob", "a.txt") == 1
+    compiled = []
+    original = acl.compile
+    monkeypatch.setattr(acl, "compile", lambda: compiled.append(1) or original())
+    policy_generation.bump()
+    assert acl.effective_mask("bob", "a.txt") == 1
+    assert compiled == []
+    other.set_rule("a.txt", "bob", {"leitura": True}, "deny")
+    assert acl.effective_mask("bob", "a.txt") == 0
+    assert compiled == [1]
@@ -0,0 +1,55 @@
+import os
+import json
+import pytest
+from core.atomic_io import AtomicWriter, temp_path_for
+from core.file_manager import FileManager
+from core.storage import JsonBackend
+
+def write_original(path):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("original")
+
+def interrupted(exception):
+    def write(file):
+        file.write("parcial")
+        file.flush()
+        raise exception
+    return write
+
+@pytest.mark.parametrize("exception", (OSError("disco cheio"), KeyboardInterrupt()))
+def test_interrupted_write_keeps_original(tmp_path, exception):
+    path = str(tmp_path / "dados.txt")
+    write_original(path)
+    with pytest.raises(type(exception)):
+        AtomicWriter().write(path, interrupted(exception), encoding="utf-8")
+    with open(path, encoding="utf-8") as file:
+        assert file.read() == "original"
+    assert os.listdir(tmp_path) == ["dados.txt"]
+
+def test_failed_replace_keeps_original(tmp_path, monkeypatch):
+    path = str(tmp_path / "dados.txt")
+    write_original(path)
+    def fail(source, target):
+        raise OSError("falha antes da troca")
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        AtomicWriter().write_text(path, "novo")
+    monkeypatch.undo()
+    with open(path, encoding="utf-8") as file:
+        assert file.read() == "original"
+    assert not os.path.exists(temp_path_for(path))
+
+def test_unserializable_records_keep_json_store(tmp_path):
+    store = JsonBackend(str(tmp_path / "store.json"))
+    store.put("alice", {"login_count": 1})
+    with pytest.raises(TypeError):
+        store.put("bob", {"login_count": object()})
+    with open(tmp_path / "store.json", encoding="utf-8") as file:
+        assert json.load(file) == {"alice": {"login_count": 1}}
+    assert JsonBackend(str(tmp_path / "store.json")).load_all() == {"alice": {"login_count": 1}}
+
+def test_leftover_temp_files_are_not_listed(workdir):
+    manager = FileManager()
+    assert manager.create_file("nota.txt", "conteudo")[0]
+    open(temp_path_for(os.path.join(manager.folder, "nota.txt")), "w").close()
+    assert [entry.name for entry in manager.list_entries()] == ["nota.txt"]
@@ -0,0 +1,51 @@
+import os
+from core.audit import AuditLog, POSTING, FILE_READ, LOGIN
+
+DAY = 1_700_000_000_000
+
+def segment_files(directory, extension):
+    return [name for name in os.listdir(directory) if name.endswith(extension)]
+
+def test_sidecar_index_grows_only_by_the_new_records(tmp_path):
+    audit = AuditLog(str(tmp_path), index_flush_every=10)
+    sizes = []
+    for number in range(35):
+        audit.record(FILE_READ, f"user{number % 3}", f"arquivo{number % 5}.txt", timestamp_ms=DAY + number)
+        postings = segment_files(tmp_path, ".pst")
+        sizes.append(os.path.getsize(tmp_path / postings[0]) if postings else 0)
+    assert sizes[8] == 0
+    assert sizes[9] == sizes[18] == 10 * POSTING.size
+    assert sizes[34] == 30 * POSTING.size
+    audit.close()
+    assert os.path.getsize(tmp_path / segment_files(tmp_path, ".pst")[0]) == 35 * POSTING.size
+
+def test_reopened_log_answers_from_the_sidecar(tmp_path):
+    audit = AuditLog(str(tmp_path), index_flush_every=4)
+    for number in range(20):
+        audit.record(LOGIN if number % 2 else FILE_READ, f"user{number % 4}", f"arquivo{number % 3}.txt", timestamp_ms=DAY + number)
+    expected = audit.query(user="user1")
+    audit.close()
+    posting = tmp_path / segment_files(tmp_path, ".pst")[0]
+    with open(posting, "ab") as file:
+        file.write(b"\x01\x02")
+
+    reopened = AuditLog(str(tmp_path), index_flush_every=4)
+    assert reopened.query(user="user1") == expected
+    assert len(reopened.query(filename="arquivo0.txt")) == 7
+    reopened.record(LOGIN, "user1", timestamp_ms=DAY + 100)
+    reopened.close()
+    assert os.path.getsize(posting) == 21 * POSTING.size
+    assert len(AuditLog(str(tmp_path)).query(user="user1")) == 6
+
+def test_interleaved_writers_index_every_record_once(tmp_path):
+    first = AuditLog(str(tmp_path), index_flush_every=3)
+    second = AuditLog(str(tmp_path), index_flush_every=5)
+    for number in range(40):
+        writer = first if number % 3 else second
+        writer.record(FILE_READ, f"user{number % 2}", timestamp_ms=DAY + number)
+    first.close()
+    second.close()
+    assert os.path.getsize(tmp_path / segment_files(tmp_path, ".pst")[0]) == 40 * POSTING.size
+    reader = AuditLog(str(tmp_path))
+    assert len(reader.query(user="user0")) == 20
+    assert len(reader.query(user="user1")) == 20
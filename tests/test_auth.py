@@ -0,0 +1,93 @@
+import pytest
+from constants import AUTH_LOCKED, AUTH_MIGRATION_REQUIRED, AUTH_SUCCESS, MAX_LOGIN_ATTEMPTS
+from utils.crypto import create_password_record
+from core import auth
+from core.security import login_limiter
+from core.credentials import credential_store
+from core.user_data import user_store
+
+def fake_record(password):
+    return {"salt": "00", "hash": password[::-1], "kdf": {"name": "fake"}}
+
+@pytest.fixture
+def fast_hash(workdir, monkeypatch):
+    monkeypatch.setattr(auth, "create_password_record", fake_record)
+    return fake_record
+
+def test_concurrent_registration_is_not_overwritten(fast_hash, monkeypatch):
+    def hash_while_bob_registers(password):
+        if credential_store.get("bob") is None:
+            assert auth.register_user("bob", "segredo-gui", {"leitura": True}, hasher=fake_record)[0]
+        return fake_record(password)
+    monkeypatch.setattr(auth, "create_password_record", hash_while_bob_registers)
+
+    results = auth.register_users([
+        {"username": "alice", "password": "segredo1"},
+        {"username": "bob", "password": "segredo2"}
+    ], workers=1)
+
+    assert [result[2:] for result in results] == [
+        (True, "Usuário 'alice' registrado com sucesso!"),
+        (False, "Usuário já existe!")
+    ]
+    assert credential_store.get("bob") == fake_record("segredo-gui")
+    assert user_store.get("bob")["permissions"] == {"leitura": True}
+
+def test_failed_user_write_rolls_back_credentials(fast_hash, monkeypatch):
+    auth.register_user("carol", "segredo0", None, hasher=fake_record)
+    def fail(records):
+        raise OSError("disco cheio")
+    monkeypatch.setattr(user_store, "put_many", fail)
+    deletes = []
+    original = credential_store.delete_many
+    monkeypatch.setattr(credential_store, "delete_many", lambda keys: deletes.append(set(keys)) or original(keys))
+
+    with pytest.raises(OSError):
+        auth.register_users([{"username": f"user{index}", "password": "segredo1"} for index in range(5)], workers=1)
+
+    assert deletes == [{f"user{index}" for index in range(5)}]
+    assert list(credential_store.load_all()) == ["carol"]
+
+def test_invalid_entries_are_rejected_before_hashing(fast_hash):
+    results = auth.register_users([
+        {"username": "dave", "password": 123456},
+        "eve",
+        {"username": "frank", "password": "segredo1", "permissions": ["leitura"]},
+        {"username": "grace", "password": "segredo1"},
+        {"username": "grace", "password": "segredo1"}
+    ], workers=1)
+    assert [result[2] for result in results] == [False, False, False, True, False]
+    assert list(credential_store.load_all()) == ["grace"]
+
+def test_legacy_credential_is_not_counted_as_failure(workdir):
+    credential_store.put("legado", "segredo1")
+    user_store.put("legado", auth._new_user_record(None))
+    for _ in range(8):
+        assert auth.authenticate_user("legado", "segredo1") == (False, AUTH_MIGRATION_REQUIRED)
+    assert not login_limiter.is_locked("legado")
+    assert user_store.get("legado")["security"]["failed_attempts"] == 0
+
+def test_each_login_reads_and_writes_each_store_at_most_once(workdir):
+    cheap = {"name": "scrypt", "n": 1024, "r": 8, "p": 1}
+    auth.register_user("ana", "segredo1", None)
+    auth.register_user("rui", "segredo1", None)
+    credential_store.put("velho", create_password_record("segredo1", cheap))
+    user_store.put("velho", auth._new_user_record(None))
+    for stats in auth.login_io_stats.values():
+        stats.reset()
+
+    assert auth.authenticate_user("ana", "segredo1") == (True, AUTH_SUCCESS)
+    assert auth.authenticate_user("ana", "errada")[0] is False
+    for _ in range(MAX_LOGIN_ATTEMPTS):
+        auth.authenticate_user("rui", "errada")
+    assert auth.authenticate_user("rui", "segredo1") == (False, AUTH_LOCKED)
+    assert auth.authenticate_user("velho", "segredo1") == (True, AUTH_SUCCESS)
+    assert credential_store.get("velho")["kdf"] != cheap
+    assert auth.authenticate_user("ninguem", "segredo1")[0] is False
+
+    for stats in auth.login_io_stats.values():
+        summary = stats.summary()
+        assert summary["operations"] == MAX_LOGIN_ATTEMPTS + 5
+        assert summary["max_reads_per_operation"] <= 1
+        assert summary["max_writes_per_operation"] <= 1
+    assert auth.login_io_stats["credentials"].summary()["writes"] == 1
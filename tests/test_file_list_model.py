@@ -0,0 +1,47 @@
+import random
+import pytest
+from core.file_manager import FileEntry, FileType, SORT_KEYS
+from gui.file_list_view import FileListModel
+
+EXTENSIONS = {".txt": FileType.TEXT, ".draw": FileType.DRAWING, ".sheet": FileType.SHEET}
+
+def random_entry(rng, number):
+    extension = rng.choice(list(EXTENSIONS))
+    return FileEntry(f"arquivo{number}{extension}", EXTENSIONS[extension], rng.randrange(50), rng.randrange(10))
+
+def make_model(column, reverse, text, file_type):
+    model = FileListModel(SORT_KEYS, lambda entries: [(entry.name,) for entry in entries])
+    model.sort_by(column)
+    if reverse:
+        model.sort_by(column)
+    model.set_filter(text, file_type)
+    return model
+
+@pytest.mark.parametrize("column", sorted(SORT_KEYS))
+@pytest.mark.parametrize("reverse", (False, True))
+@pytest.mark.parametrize("text, file_type", (("", None), ("1", None), ("", FileType.SHEET)))
+def test_incremental_update_matches_full_rebuild(column, reverse, text, file_type):
+    rng = random.Random(f"{column}{reverse}{text}{file_type}")
+    entries = {entry.name: entry for entry in (random_entry(rng, number) for number in range(300))}
+    model = make_model(column, reverse, text, file_type)
+    model.set_entries(entries.values())
+    next_number = 300
+    for _ in range(60):
+        for _ in range(rng.randrange(1, 6)):
+            action = rng.random()
+            if action < 0.3 and entries:
+                del entries[rng.choice(list(entries))]
+            elif action < 0.6:
+                entry = random_entry(rng, next_number)
+                entries[entry.name] = entry
+                next_number += 1
+            elif entries:
+                name = rng.choice(list(entries))
+                entries[name] = entries[name]._replace(size=rng.randrange(50), mtime_ns=rng.randrange(10))
+        model.scroll_to(rng.randrange(len(model.view) + 1))
+        model.set_entries(list(entries.values()))
+
+        expected = make_model(column, reverse, text, file_type)
+        expected.set_entries(list(entries.values()))
+        assert model.view == expected.view
+        assert model.offset == model.clamp(model.offset)
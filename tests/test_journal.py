@@ -0,0 +1,65 @@
+import threading
+from core.journal import SecurityJournal
+
+def locked(attempts):
+    return {"failed_attempts": attempts, "is_locked": attempts >= 5, "lock_time": None}
+
+class MemoryStore:
+    def __init__(self, users, during_write=None):
+        self.users = users
+        self.during_write = during_write
+
+    def get(self, username):
+        user = self.users.get(username)
+        return dict(user) if user is not None else None
+
+    def put_many(self, records):
+        if self.during_write is not None:
+            self.during_write()
+        self.users.update(records)
+
+def test_replay_after_restart_restores_latest_state(tmp_path):
+    path = str(tmp_path / "security.journal")
+    journal = SecurityJournal(path)
+    journal.append("alice", "fail", locked(1))
+    journal.append_many([("alice", "fail", locked(2)), ("bob", "fail", locked(1))])
+    with open(path, "a", encoding="utf-8") as file:
+        file.write('{"u": "carol", "op": "fa')
+
+    restarted = SecurityJournal(path)
+    assert restarted.replay() == {"alice": locked(2), "bob": locked(1)}
+    assert restarted.entries == 3
+
+def test_compaction_moves_state_to_store_and_empties_journal(tmp_path):
+    path = str(tmp_path / "security.journal")
+    journal = SecurityJournal(path)
+    journal.append("alice", "fail", locked(3))
+    journal.append("ghost", "fail", locked(1))
+    store = MemoryStore({"alice": {"login_count": 4}})
+
+    assert journal.compact(store) == 2
+    assert store.users["alice"] == {"login_count": 4, "security": locked(3)}
+    assert "ghost" not in store.users
+    assert journal.entries == 0
+    assert SecurityJournal(path).replay() == {}
+
+def test_appends_during_store_write_are_kept(tmp_path):
+    path = str(tmp_path / "security.journal")
+    journal = SecurityJournal(path)
+    journal.append("alice", "fail", locked(1))
+    seen = []
+
+    def concurrent_login():
+        reader = threading.Thread(target=lambda: seen.append(journal.get("alice")))
+        reader.start()
+        reader.join(timeout=5)
+        journal.append("alice", "fail", locked(2))
+        journal.append("bob", "fail", locked(1))
+
+    store = MemoryStore({"alice": {}, "bob": {}}, concurrent_login)
+    assert journal.compact(store) == 1
+    assert seen == [locked(1)]
+    assert store.users["alice"]["security"] == locked(1)
+    assert journal.get("alice") == locked(2)
+    assert journal.entries == 2
+    assert SecurityJournal(path).replay() == {"alice": locked(2), "bob": locked(1)}
@@ -0,0 +1,47 @@
+import pytest
+from core.acl import file_acl
+from core.permissions import PERM_READ, PERM_WRITE, DecisionCache, PolicyGeneration, decision_cache
+from core.roles import check_permission, set_user_permissions
+from core.session import Session
+from core.user_data import user_store
+
+@pytest.fixture
+def bob(workdir):
+    decision_cache.clear()
+    user_store.put("bob", {"permissions": {"leitura": True, "escrita": True, "remocao": False}})
+    file_acl.compile()
+    return "bob"
+
+def test_revoking_global_permission_invalidates_cached_decision(bob):
+    assert check_permission(bob, "escrita")
+    assert check_permission(bob, "escrita")
+    set_user_permissions(bob, {"leitura": True, "escrita": False})
+    assert not check_permission(bob, "escrita")
+    assert check_permission(bob, "leitura")
+
+def test_revoking_file_rule_invalidates_session_decision(bob):
+    session = Session(bob)
+    assert session.can(PERM_READ, "a.txt")
+    file_acl.set_rule("a.txt", "bob", {"leitura": True}, "deny")
+    assert not session.can(PERM_READ, "a.txt")
+    assert session.can(PERM_WRITE, "a.txt")
+    file_acl.remove("a.txt")
+    assert session.can(PERM_READ, "a.txt")
+
+def test_new_owner_does_not_keep_cached_denial(bob):
+    user_store.put("carol", {"permissions": {}})
+    session = Session("carol")
+    assert not session.can(PERM_WRITE, "novo.txt")
+    file_acl.set_owner("novo.txt", "carol")
+    assert session.can(PERM_WRITE, "novo.txt")
+
+def test_bump_from_another_process_invalidates_cache(workdir):
+    cache = DecisionCache(generation=PolicyGeneration("data/policy.gen"))
+    other = PolicyGeneration("data/policy.gen")
+    allowed = {"value": True}
+    assert cache.get(("bob", PERM_READ, "a.txt"), lambda: allowed["value"])
+    allowed["value"] = False
+    assert cache.get(("bob", PERM_READ, "a.txt"), lambda: allowed["value"])
+    other.bump()
+    assert not cache.get(("bob", PERM_READ, "a.txt"), lambda: allowed["value"])
+    assert cache.invalidations == 1
@@ -0,0 +1,41 @@
+from core.rate_limit import LoginRateLimiter
+
+def make_limiter():
+    return LoginRateLimiter(max_attempts=3, window_seconds=60, lock_seconds=300)
+
+def test_locks_after_max_attempts_inside_window():
+    limiter = make_limiter()
+    assert limiter.record_failure("alice", now=1000) == (1, False)
+    assert limiter.record_failure("alice", now=1010) == (2, False)
+    assert limiter.record_failure("alice", now=1020) == (3, True)
+    assert limiter.locked_until("alice", now=1021) == 1320
+    assert limiter.is_locked("alice", now=1319)
+
+def test_failures_outside_window_expire():
+    limiter = make_limiter()
+    limiter.record_failure("alice", now=1000)
+    limiter.record_failure("alice", now=1030)
+    assert limiter.attempts("alice", now=1059) == 2
+    assert limiter.attempts("alice", now=1060) == 1
+    assert limiter.record_failure("alice", now=1075) == (2, False)
+    assert not limiter.is_locked("alice", now=1075)
+
+def test_lock_expires_and_clears_failures():
+    limiter = make_limiter()
+    for now in (1000, 1001, 1002):
+        limiter.record_failure("alice", now=now)
+    assert limiter.is_locked("alice", now=1301)
+    assert not limiter.is_locked("alice", now=1302)
+    assert limiter.attempts("alice", now=1302) == 0
+    assert len(limiter) == 0
+
+def test_keys_are_independent_and_reset_unlocks():
+    limiter = make_limiter()
+    for now in (1000, 1001, 1002):
+        limiter.record_failure("alice", now=now)
+    limiter.record_failure("bob", now=1002)
+    assert limiter.is_locked("alice", now=1003)
+    assert not limiter.is_locked("bob", now=1003)
+    limiter.reset("alice")
+    assert not limiter.is_locked("alice", now=1003)
+    assert limiter.attempts("bob", now=1003) == 1
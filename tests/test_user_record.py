@@ -0,0 +1,74 @@
+import json
+import time
+import pytest
+from core import user_record
+from core.user_record import UserRecord
+from core.user_data import UserStore
+
+def canonical(value):
+    return json.dumps(value, sort_keys=True)
+
+def round_trip(user):
+    return UserRecord.from_dict("alice", user).to_dict()
+
+BASE = {
+    "created_at": "2024-01-02 03:04:05",
+    "last_login": "",
+    "login_count": 3,
+    "notes": ["a"],
+    "settings": {"theme": "dark"},
+    "security": {"failed_attempts": 1, "is_locked": False, "lock_time": None},
+    "permissions": {"leitura": True, "escrita": False, "remocao": False}
+}
+
+@pytest.fixture
+def new_york(monkeypatch):
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    user_record._hour_epoch.cache_clear()
+    user_record._minute_text.cache_clear()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+    user_record._hour_epoch.cache_clear()
+    user_record._minute_text.cache_clear()
+
+@pytest.mark.parametrize("changes", [
+    {},
+    {"avatar": "gato.png", "extra": {"nested": [1, 2]}},
+    {"permissions": {"leitura": True, "escrita": False}},
+    {"permissions": {"leitura": 1, "escrita": 0, "remocao": 0}},
+    {"permissions": {"leitura": True, "escrita": False, "remocao": False, "admin": True}},
+    {"settings": {"theme": "dark", "font": 12}},
+    {"settings": {"theme": None}},
+    {"settings": []},
+    {"security": {"failed_attempts": 5, "is_locked": True, "lock_time": "2024-01-02 03:04:05", "lock_until": 1704164645}},
+    {"security": {"failed_attempts": 5, "is_locked": True, "lock_time": "ontem"}},
+    {"security": {"failed_attempts": True, "is_locked": False}},
+    {"security": {"failed_attempts": 0, "is_locked": False, "lock_until": False}},
+    {"security": {"failed_attempts": 0, "is_locked": False, "motivo": "x"}},
+    {"login_count": "3", "notes": "texto", "created_at": "2024-01-02T03:04:05"},
+    {"created_at": "2024-02-30 10:00:00", "last_login": None},
+])
+def test_round_trip_is_lossless(changes):
+    user = dict(BASE, **changes)
+    assert canonical(round_trip(user)) == canonical(user)
+
+@pytest.mark.parametrize("moment", [
+    "2024-03-10 02:30:00",
+    "2024-03-10 01:59:59",
+    "2024-03-10 03:00:00",
+    "2024-11-03 01:30:00",
+    "2024-11-03 00:59:59",
+])
+def test_round_trip_across_dst_transitions(new_york, moment):
+    user = dict(BASE, created_at=moment, last_login=moment)
+    assert canonical(round_trip(user)) == canonical(user)
+
+def test_store_keeps_non_dict_entries(tmp_path):
+    path = str(tmp_path / "user_data.json")
+    users = {"alice": dict(BASE, avatar="x"), "bob": None, "carol": ["legado"], "dave": "texto"}
+    UserStore(path).save_all(users)
+    with open(path, encoding="utf-8") as file:
+        assert canonical(json.load(file)) == canonical(users)
+    assert canonical(UserStore(path).load_all()) == canonical(users)
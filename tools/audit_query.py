@@ -0,0 +1,22 @@
+import argparse
+from datetime import date
+from core.audit import audit_log, EVENT_CODES
+
+def main():
+    parser = argparse.ArgumentParser(description="Consulta a auditoria de acessos por usuário, arquivo, período e evento.")
+    parser.add_argument("--usuario", help="Filtra por usuário")
+    parser.add_argument("--arquivo", help="Filtra por arquivo")
+    parser.add_argument("--desde", type=date.fromisoformat, help="Data inicial (AAAA-MM-DD)")
+    parser.add_argument("--ate", type=date.fromisoformat, help="Data final (AAAA-MM-DD)")
+    parser.add_argument("--evento", action="append", choices=sorted(EVENT_CODES), help="Tipo de evento (pode repetir)")
+    args = parser.parse_args()
+
+    events = {EVENT_CODES[name] for name in args.evento} if args.evento else None
+    rows = audit_log.query(args.usuario, args.arquivo, args.desde, args.ate, events)
+    for row in rows:
+        print(f"{row['timestamp']:%Y-%m-%d %H:%M:%S} {row['event']:<18} "
+              f"usuário={row['user'] or '-'} arquivo={row['file'] or '-'} detalhe={row['detail']}")
+    print(f"{len(rows)} registro(s).")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+import asyncio
+import argparse
+from constants import AUTH_SOCKET_FILE
+from core.auth_daemon import AuthDaemon
+from utils.logger import setup_logging
+
+def main():
+    parser = argparse.ArgumentParser(description="Daemon local de autenticação via socket Unix.")
+    parser.add_argument("--socket", default=AUTH_SOCKET_FILE, help="Caminho do socket Unix")
+    parser.add_argument("--hash-workers", type=int, default=None, help="Processos para hash de senhas")
+    args = parser.parse_args()
+    setup_logging()
+
+    asyncio.run(AuthDaemon(args.socket, hash_workers=args.hash_workers).serve())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import os
+import time
+import random
+import argparse
+import tempfile
+from core.acl import FileAcl, ROOT
+from core.storage import JsonBackend
+from core.permissions import PERMISSION_BITS, PERM_READ, PERM_WRITE, PERM_DELETE, PolicyGeneration
+
+ACTIONS = PERM_READ | PERM_WRITE | PERM_DELETE
+
+def build_acl(workdir, files, users, rules_ratio, seed):
+    rng = random.Random(seed)
+    names = list(PERMISSION_BITS)
+    groups = {f"grupo{index}": [f"user{member}" for member in rng.sample(range(users), min(users, 50))] for index in range(10)}
+    entries = {ROOT: {"allow": {"@grupo0": ["leitura"]}, "deny": {"@grupo1": ["remocao"]}}}
+    for index in range(int(files * rules_ratio)):
+        entry = {"owner": f"user{rng.randrange(users)}"}
+        if index % 3 == 0:
+            entry["allow"] = {f"user{rng.randrange(users)}": rng.sample(names, 2)}
+        if index % 5 == 0:
+            entry["deny"] = {f"@grupo{rng.randrange(10)}": rng.sample(names, 1)}
+        entries[f"arquivo{rng.randrange(files)}.txt"] = entry
+    store = JsonBackend(os.path.join(workdir, "acl.json"))
+    store.save_all(entries)
+    group_store = JsonBackend(os.path.join(workdir, "acl_groups.json"))
+    group_store.save_all(groups)
+    return FileAcl(store, group_store, PolicyGeneration(os.path.join(workdir, "acl.gen")))
+
+def _timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara a avaliação de permissões arquivo a arquivo com evaluate_many.")
+    parser.add_argument("--files", type=int, default=100000, help="Número de arquivos da listagem")
+    parser.add_argument("--users", type=int, default=2000, help="Número de usuários")
+    parser.add_argument("--rules-ratio", type=float, default=0.2, help="Fração de arquivos com ACL própria")
+    parser.add_argument("--samples", type=int, default=20, help="Usuários amostrados")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="role_bac_bench_") as workdir:
+        acl = build_acl(workdir, args.files, args.users, args.rules_ratio, args.seed)
+        _, compile_time = _timed(acl._revalidate)
+        files = [f"arquivo{index}.txt" for index in range(args.files)]
+        users = [f"user{index}" for index in random.Random(args.seed).sample(range(args.users), min(args.samples, args.users))]
+
+        loop_time = 0.0
+        batch_time = 0.0
+        for username in users:
+            expected, elapsed = _timed(lambda: [
+                (PERM_READ if acl.can(username, PERM_READ, name, PERM_READ) else 0) |
+                (PERM_WRITE if acl.can(username, PERM_WRITE, name, PERM_READ) else 0) |
+                (PERM_DELETE if acl.can(username, PERM_DELETE, name, PERM_READ) else 0)
+                for name in files
+            ])
+            loop_time += elapsed
+            matrix, elapsed = _timed(lambda: acl.evaluate_many(username, files, PERM_READ, ACTIONS))
+            batch_time += elapsed
+            if matrix != expected:
+                print(f"Divergência na matriz de {username}!")
+                return
+
+    print(f"Arquivos: {args.files} | usuários: {args.users} | compilação do índice: {compile_time * 1000:.1f} ms")
+    print(f"Verificação por arquivo (3 checagens): {loop_time / len(users) * 1000:.1f} ms por listagem")
+    print(f"evaluate_many:                        {batch_time / len(users) * 1000:.1f} ms por listagem")
+    print(f"Ganho: {loop_time / max(batch_time, 1e-9):.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import argparse
+from constants import KDF_TARGET_MS, KDF_CONFIG_FILE
+from utils.crypto import calibrate, save_kdf_params
+from utils.logger import setup_logging
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o desempenho da máquina e escolhe os parâmetros do hash de senha.")
+    parser.add_argument("--target-ms", type=float, default=KDF_TARGET_MS, help="Tempo alvo de verificação em milissegundos")
+    parser.add_argument("--algorithm", choices=("scrypt", "pbkdf2_sha256"), default="scrypt")
+    parser.add_argument("--dry-run", action="store_true", help="Apenas mostra o resultado, sem salvar")
+    args = parser.parse_args()
+    setup_logging()
+
+    params, elapsed = calibrate(args.target_ms, args.algorithm)
+    print(f"Parâmetros escolhidos: {params} ({elapsed:.1f} ms por verificação)")
+
+    if not args.dry_run:
+        save_kdf_params(params)
+        print(f"Parâmetros salvos em {KDF_CONFIG_FILE}. Senhas abaixo deste custo serão refeitas no próximo login.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import logging
+import tempfile
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import constants
+from utils.logger import ROOT_LOGGER
+
+PASSWORD = "senha123"
+KINDS = ("good", "bad", "locked", "unknown")
+
+def _io_counters():
+    try:
+        with open("/proc/self/io", "r") as file:
+            values = dict(line.split(": ") for line in file.read().splitlines())
+        return int(values["rchar"]), int(values["wchar"])
+    except (OSError, KeyError, ValueError):
+        return 0, 0
+
+@contextmanager
+def _store_context(workdir, backend):
+    cwd, stdout, previous_backend = os.getcwd(), sys.stdout, constants.STORAGE_BACKEND
+    quiet = logging.NullHandler()
+    logging.getLogger(ROOT_LOGGER).addHandler(quiet)
+    os.chdir(workdir)
+    constants.STORAGE_BACKEND = backend
+    try:
+        with open(os.devnull, "w") as devnull:
+            sys.stdout = devnull
+            yield
+    finally:
+        logging.getLogger(ROOT_LOGGER).removeHandler(quiet)
+        sys.stdout = stdout
+        constants.STORAGE_BACKEND = previous_backend
+        os.chdir(cwd)
+
+def build_store(workdir, users, locked_ratio, backend):
+    with _store_context(workdir, backend):
+        return _build_store(users, locked_ratio, backend)
+
+def _build_store(users, locked_ratio, backend):
+    from utils.crypto import create_password_record
+    from core.storage import migrate_json_to_sqlite
+
+    os.makedirs(os.path.dirname(constants.USER_DATA_FILE), exist_ok=True)
+    credential = create_password_record(PASSWORD)
+    lock_until = int(time.time()) + 24 * 3600
+    locked_count = int(users * locked_ratio)
+
+    credentials = {}
+    user_data = {}
+    for index in range(users):
+        username = f"user{index}"
+        locked = index < locked_count
+        credentials[username] = credential
+        user_data[username] = {
+            "created_at": "2024-01-01 00:00:00",
+            "last_login": "",
+            "login_count": 0,
+            "notes": [],
+            "settings": {"theme": "light"},
+            "security": {
+                "failed_attempts": constants.MAX_LOGIN_ATTEMPTS if locked else 0,
+                "is_locked": locked,
+                "lock_time": "2024-01-01 00:00:00" if locked else None,
+                "lock_until": lock_until if locked else None
+            },
+            "permissions": {"leitura": True, "escrita": index % 2 == 0, "remocao": False}
+        }
+
+    with open(constants.CREDENTIALS_FILE, "w") as file:
+        json.dump(credentials, file, indent=4)
+    with open(constants.USER_DATA_FILE, "w") as file:
+        json.dump(user_data, file, indent=4)
+
+    if backend == "sqlite":
+        migrate_json_to_sqlite({
+            "credentials": constants.CREDENTIALS_FILE,
+            "user_data": constants.USER_DATA_FILE
+        })
+    return locked_count
+
+def _pick(rng, kind, users, locked_count):
+    if kind == "unknown":
+        return f"ghost{rng.randrange(users)}", PASSWORD
+    if kind == "locked":
+        return f"user{rng.randrange(max(locked_count, 1))}", PASSWORD
+    username = f"user{rng.randrange(min(locked_count, users - 1), users)}"
+    return username, PASSWORD if kind == "good" else "senha-errada"
+
+def _run_requests(seed, requests, users, locked_count, weights):
+    from core.auth import authenticate_user
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(requests):
+        kind = rng.choices(KINDS, weights)[0]
+        username, password = _pick(rng, kind, users, locked_count)
+        start = time.perf_counter()
+        success, _ = authenticate_user(username, password)
+        samples.append((kind, time.perf_counter() - start, success))
+    return samples
+
+def _login_io_summary(reset=False):
+    from core.auth import login_io_stats
+    if reset:
+        for stats in login_io_stats.values():
+            stats.reset()
+    return {store: stats.summary() for store, stats in login_io_stats.items()}
+
+def _merge_io(summaries):
+    merged = {}
+    for summary in summaries:
+        for store, stats in summary.items():
+            total = merged.setdefault(store, dict.fromkeys(stats, 0))
+            for key, value in stats.items():
+                total[key] = max(total[key], value) if key.startswith("max_") else total[key] + value
+    return merged
+
+def _process_worker(workdir, backend, seed, requests, users, locked_count, weights):
+    with _store_context(workdir, backend):
+        _login_io_summary(reset=True)
+        read_before, written_before = _io_counters()
+        samples = _run_requests(seed, requests, users, locked_count, weights)
+        read_after, written_after = _io_counters()
+        io = _login_io_summary()
+    return samples, read_after - read_before, written_after - written_before, io
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+    return values[index]
+
+def count_logins(workdir, backend):
+    with _store_context(workdir, backend):
+        from core.user_data import user_store
+        if hasattr(user_store, "invalidate"):
+            user_store.invalidate()
+        return sum(user.get("login_count", 0) for user in user_store.load_all().values())
+
+def run(args):
+    workdir = args.workdir or tempfile.mkdtemp(prefix="role_bac_load_")
+    weights = [args.good, args.bad, args.locked, args.unknown]
+    per_worker = max(1, args.requests // args.workers)
+
+    try:
+        locked_count = build_store(workdir, args.users, args.locked_ratio, args.backend)
+        started = time.perf_counter()
+        if args.mode == "process":
+            with ProcessPoolExecutor(max_workers=args.workers) as executor:
+                futures = [
+                    executor.submit(_process_worker, workdir, args.backend, args.seed + worker,
+                                    per_worker, args.users, locked_count, weights)
+                    for worker in range(args.workers)
+                ]
+                results = [future.result() for future in futures]
+            samples = [sample for result in results for sample in result[0]]
+            bytes_read = sum(result[1] for result in results)
+            bytes_written = sum(result[2] for result in results)
+            login_io = _merge_io(result[3] for result in results)
+        else:
+            with _store_context(workdir, args.backend):
+                _login_io_summary(reset=True)
+                read_before, written_before = _io_counters()
+                with ThreadPoolExecutor(max_workers=args.workers) as executor:
+                    futures = [
+                        executor.submit(_run_requests, args.seed + worker, per_worker,
+                                        args.users, locked_count, weights)
+                        for worker in range(args.workers)
+                    ]
+                    samples = [sample for future in futures for sample in future.result()]
+                read_after, written_after = _io_counters()
+                login_io = _login_io_summary()
+            bytes_read = read_after - read_before
+            bytes_written = written_after - written_before
+        elapsed = time.perf_counter() - started
+
+        successes = sum(1 for _, _, success in samples if success)
+        lost_updates = successes - count_logins(workdir, args.backend)
+    finally:
+        if not args.keep and not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    latencies = sorted(latency for _, latency, _ in samples)
+    total = len(samples)
+    print(f"Usuários: {args.users} | backend: {args.backend} | modo: {args.mode} x{args.workers}")
+    print(f"Logins: {total} em {elapsed:.2f}s ({total / elapsed:.1f} logins/s), {successes} bem-sucedidos")
+    print(f"Latência p50={_percentile(latencies, 0.50) * 1000:.1f} ms "
+          f"p95={_percentile(latencies, 0.95) * 1000:.1f} ms "
+          f"p99={_percentile(latencies, 0.99) * 1000:.1f} ms")
+    for kind in KINDS:
+        kind_latencies = sorted(latency for sample_kind, latency, _ in samples if sample_kind == kind)
+        if kind_latencies:
+            print(f"  {kind:<8} n={len(kind_latencies):<6} p50={_percentile(kind_latencies, 0.50) * 1000:.1f} ms "
+                  f"p99={_percentile(kind_latencies, 0.99) * 1000:.1f} ms")
+    print(f"Bytes lidos/login: {bytes_read / max(total, 1):.0f} | bytes escritos/login: {bytes_written / max(total, 1):.0f}")
+    for store, stats in login_io.items():
+        operations = max(stats["operations"], 1)
+        print(f"E/S de {store} por login: {stats['reads'] / operations:.2f} leitura(s) e "
+              f"{stats['writes'] / operations:.2f} escrita(s) em média, "
+              f"máximo {stats['max_reads_per_operation']}/{stats['max_writes_per_operation']}")
+    print(f"Atualizações perdidas (login_count): {lost_updates}")
+    if args.keep or args.workdir:
+        print(f"Dados mantidos em {workdir}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga de login sem interface gráfica.")
+    parser.add_argument("--users", type=int, default=1000, help="Tamanho da base sintética")
+    parser.add_argument("--requests", type=int, default=2000, help="Total de tentativas de login")
+    parser.add_argument("--workers", type=int, default=4, help="Threads ou processos concorrentes")
+    parser.add_argument("--mode", choices=("thread", "process"), default="thread")
+    parser.add_argument("--backend", choices=("json", "sqlite"), default=constants.STORAGE_BACKEND)
+    parser.add_argument("--good", type=float, default=70, help="Peso de logins corretos")
+    parser.add_argument("--bad", type=float, default=20, help="Peso de senhas incorretas")
+    parser.add_argument("--locked", type=float, default=5, help="Peso de contas bloqueadas")
+    parser.add_argument("--unknown", type=float, default=5, help="Peso de usuários inexistentes")
+    parser.add_argument("--locked-ratio", type=float, default=0.05, help="Fração da base criada já bloqueada")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workdir", help="Diretório da base sintética (padrão: temporário)")
+    parser.add_argument("--keep", action="store_true", help="Não apaga a base sintética ao final")
+    args = parser.parse_args()
+    if args.users < 1:
+        parser.error("--users deve ser pelo menos 1.")
+    if not 0 <= args.locked_ratio < 1:
+        parser.error("--locked-ratio deve estar em [0, 1): é preciso haver contas desbloqueadas.")
+    run(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import json
+import argparse
+from datetime import datetime
+from core.credentials import migrate_legacy_credentials
+from utils.logger import setup_logging
+
+def main():
+    parser = argparse.ArgumentParser(description="Converte credenciais legadas (texto puro ou sem salt) para o formato com hash.")
+    parser.add_argument("--workers", type=int, default=None, help="Processos para gerar os hashes de senha")
+    parser.add_argument("--dry-run", action="store_true", help="Apenas conta os registros legados, sem gravar")
+    parser.add_argument("--report", help="Arquivo JSON onde o relatório será salvo")
+    args = parser.parse_args()
+    setup_logging()
+
+    report = migrate_legacy_credentials(workers=args.workers, dry_run=args.dry_run)
+    report["finished_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    print(f"Credenciais analisadas: {report['total']}")
+    print(f"Credenciais legadas: {report['legacy']}")
+    print(f"Credenciais migradas: {len(report['migrated'])}")
+    for username in report["migrated"]:
+        print(f"  - {username}")
+
+    if args.report:
+        with open(args.report, 'w', encoding="utf-8") as file:
+            json.dump(report, file, indent=4, ensure_ascii=False)
+        print(f"Relatório salvo em {args.report}")
+
+if __name__ == "__main__":
+    main()
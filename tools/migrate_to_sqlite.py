@@ -0,0 +1,28 @@
+import argparse
+from constants import CREDENTIALS_FILE, USER_DATA_FILE, DATABASE_FILE, ACL_FILE, ACL_GROUPS_FILE
+from core.storage import migrate_json_to_sqlite
+from utils.logger import setup_logging
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa os arquivos JSON de credenciais e dados de usuários para o SQLite.")
+    parser.add_argument("--db", default=DATABASE_FILE, help="Caminho do banco SQLite de destino")
+    parser.add_argument("--credentials", default=CREDENTIALS_FILE, help="Arquivo JSON de credenciais")
+    parser.add_argument("--user-data", default=USER_DATA_FILE, help="Arquivo JSON de dados de usuários")
+    parser.add_argument("--acl", default=ACL_FILE, help="Arquivo JSON das ACLs de arquivos")
+    parser.add_argument("--acl-groups", default=ACL_GROUPS_FILE, help="Arquivo JSON dos grupos das ACLs")
+    args = parser.parse_args()
+    setup_logging()
+
+    report = migrate_json_to_sqlite({
+        "credentials": args.credentials,
+        "user_data": args.user_data,
+        "acl": args.acl,
+        "acl_groups": args.acl_groups
+    }, args.db)
+
+    for table, count in report.items():
+        print(f"{table}: {count} registro(s) importado(s) para {args.db}")
+    print("Defina STORAGE_BACKEND = \"sqlite\" em constants.py para usar o novo banco.")
+
+if __name__ == "__main__":
+    main()
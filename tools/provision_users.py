@@ -0,0 +1,66 @@
+import os
+import csv
+import json
+import argparse
+from core.auth import register_users
+from utils.logger import setup_logging
+
+PERMISSION_NAMES = ("leitura", "escrita", "remocao")
+TRUE_VALUES = ("1", "true", "sim", "s", "yes", "y", "x")
+
+def _parse_flag(value):
+    if isinstance(value, bool):
+        return value
+    return str(value or "").strip().lower() in TRUE_VALUES
+
+def _normalize(row):
+    permissions = row.get("permissions")
+    if not isinstance(permissions, dict):
+        permissions = {name: row.get(name, False) for name in PERMISSION_NAMES}
+    return {
+        "username": row.get("username", ""),
+        "password": row.get("password", ""),
+        "permissions": {name: _parse_flag(permissions.get(name, False)) for name in PERMISSION_NAMES}
+    }
+
+def read_users(path):
+    if os.path.splitext(path)[1].lower() in (".jsonl", ".ndjson"):
+        with open(path, "r", encoding="utf-8") as file:
+            for number, line in enumerate(file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield _normalize(json.loads(line))
+                except json.JSONDecodeError as e:
+                    yield {"username": f"<linha {number}>", "password": "", "error": str(e)}
+    else:
+        with open(path, "r", encoding="utf-8", newline="") as file:
+            for row in csv.DictReader(file):
+                yield _normalize(row)
+
+def main():
+    parser = argparse.ArgumentParser(description="Cadastra usuários em lote a partir de um arquivo CSV ou JSONL.")
+    parser.add_argument("arquivo", help="CSV (username,password,leitura,escrita,remocao) ou JSONL")
+    parser.add_argument("--workers", type=int, default=None, help="Processos para gerar os hashes de senha")
+    args = parser.parse_args()
+    setup_logging()
+
+    rows = list(read_users(args.arquivo))
+    invalid = [(index, row) for index, row in enumerate(rows) if "error" in row]
+    valid = [row for row in rows if "error" not in row]
+
+    results = register_users(valid, workers=args.workers)
+
+    created = 0
+    for _, username, success, message in results:
+        if success:
+            created += 1
+        else:
+            print(f"ERRO {username or '<vazio>'}: {message}")
+    for _, row in invalid:
+        print(f"ERRO {row['username']}: {row['error']}")
+
+    print(f"{created} usuário(s) criado(s), {len(rows) - created} com erro.")
+
+if __name__ == "__main__":
+    main()
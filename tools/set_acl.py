@@ -0,0 +1,54 @@
+import argparse
+from core.acl import file_acl, ROOT
+from core.permissions import PERMISSION_BITS
+from utils.logger import setup_logging
+
+def parse_rule(value):
+    principal, _, names = value.partition("=")
+    names = [name.strip() for name in names.split(",") if name.strip()]
+    unknown = [name for name in names if name not in PERMISSION_BITS]
+    if not principal or unknown:
+        raise argparse.ArgumentTypeError(f"Regra inválida: {value} (use usuario=leitura,escrita ou @grupo=remocao)")
+    return principal, {name: True for name in names}
+
+def main():
+    parser = argparse.ArgumentParser(description="Define dono, regras de permissão e grupos das ACLs de arquivos.")
+    parser.add_argument("caminho", nargs="?", help=f"Arquivo em data/arquivos ou '{ROOT}' para a pasta inteira")
+    parser.add_argument("--dono", help="Define o dono (acesso total); vazio remove")
+    parser.add_argument("--permitir", type=parse_rule, action="append", default=[], help="usuario=perm1,perm2 ou @grupo=perm (vazio remove a regra)")
+    parser.add_argument("--negar", type=parse_rule, action="append", default=[], help="Igual a --permitir, mas nega; negações vencem permissões no mesmo nível")
+    parser.add_argument("--limpar", action="store_true", help="Remove a ACL do caminho")
+    parser.add_argument("--grupo", nargs=2, metavar=("NOME", "MEMBROS"), help="Define os membros (separados por vírgula) de um grupo")
+    args = parser.parse_args()
+    setup_logging()
+
+    if args.grupo:
+        name, members = args.grupo
+        file_acl.set_group(name, [member.strip() for member in members.split(",") if member.strip()])
+        print(f"Grupo '{name}' atualizado.")
+    if args.caminho is None:
+        if not args.grupo:
+            parser.error("Informe um caminho ou --grupo.")
+        return
+
+    if args.limpar:
+        file_acl.remove(args.caminho)
+    if args.dono is not None:
+        file_acl.set_owner(args.caminho, args.dono)
+    for principal, permissions in args.permitir:
+        file_acl.set_rule(args.caminho, principal, permissions, "allow")
+    for principal, permissions in args.negar:
+        file_acl.set_rule(args.caminho, principal, permissions, "deny")
+
+    entry = file_acl.entry(args.caminho)
+    if entry is None:
+        print(f"Sem ACL para '{args.caminho}'; valem as permissões globais do usuário.")
+        return
+    print(f"ACL de '{args.caminho}':")
+    print(f"  dono: {entry.get('owner') or '-'}")
+    for kind, label in (("allow", "permitir"), ("deny", "negar")):
+        for principal, names in entry.get(kind, {}).items():
+            print(f"  {label}: {principal} = {', '.join(names)}")
+
+if __name__ == "__main__":
+    main()
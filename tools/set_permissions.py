@@ -0,0 +1,30 @@
+import argparse
+from core.permissions import PERMISSION_BITS
+from core.roles import set_user_permissions
+from core.user_data import user_store
+from utils.logger import setup_logging
+
+def main():
+    parser = argparse.ArgumentParser(description="Altera as permissões de um usuário e invalida as sessões abertas.")
+    parser.add_argument("usuario")
+    for name in PERMISSION_BITS:
+        parser.add_argument(f"--{name}", choices=("sim", "nao"), help=f"Concede ou revoga a permissão de {name}")
+    args = parser.parse_args()
+    setup_logging()
+
+    user = user_store.get(args.usuario)
+    if user is None:
+        print("Usuário não encontrado.")
+        return
+
+    permissions = dict(user.get("permissions", {}))
+    for name in PERMISSION_BITS:
+        value = getattr(args, name)
+        if value is not None:
+            permissions[name] = value == "sim"
+
+    success, message = set_user_permissions(args.usuario, permissions)
+    print(message)
+
+if __name__ == "__main__":
+    main()
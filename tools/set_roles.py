@@ -0,0 +1,39 @@
+import argparse
+from core.roles import role_registry
+from core.permissions import mask_to_permissions
+from utils.logger import setup_logging
+
+def _names(value):
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerencia papéis (com herança), suas permissões e as atribuições aos usuários.")
+    parser.add_argument("--papel", help="Papel a criar ou alterar")
+    parser.add_argument("--herda", type=_names, help="Papéis herdados, separados por vírgula (vazio remove)")
+    parser.add_argument("--concede", type=_names, help="Permissões concedidas, separadas por vírgula (vazio remove)")
+    parser.add_argument("--remover-papel", help="Remove um papel que não esteja herdado nem atribuído")
+    parser.add_argument("--usuario", help="Usuário cujos papéis serão definidos")
+    parser.add_argument("--papeis", type=_names, help="Papéis do usuário, separados por vírgula (vazio remove todos)")
+    args = parser.parse_args()
+    setup_logging()
+
+    if args.papel:
+        success, message = role_registry.define_role(args.papel, args.herda, args.concede)
+        print(message)
+    if args.remover_papel:
+        success, message = role_registry.remove_role(args.remover_papel)
+        print(message)
+    if args.usuario:
+        if args.papeis is not None:
+            success, message = role_registry.assign(args.usuario, args.papeis)
+            print(message)
+        print(f"Papéis de '{args.usuario}': {', '.join(role_registry.roles_of(args.usuario)) or 'nenhum'}")
+        return
+
+    for name, (definition, closure) in sorted(role_registry.roles().items()):
+        effective = [permission for permission, value in mask_to_permissions(closure).items() if value]
+        print(f"{name}: herda [{', '.join(definition.get('inherits', []))}] "
+              f"concede [{', '.join(definition.get('grants', []))}] efetivo [{', '.join(effective)}]")
+
+if __name__ == "__main__":
+    main()
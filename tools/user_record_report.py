@@ -0,0 +1,70 @@
+import gc
+import json
+import time
+import random
+import argparse
+import tracemalloc
+from core.user_record import UserRecord, TIME_FORMAT
+
+def synthetic_users(count, seed):
+    rng = random.Random(seed)
+    base = int(time.mktime(time.strptime("2024-01-01 00:00:00", TIME_FORMAT)))
+    users = {}
+    for index in range(count):
+        locked = index % 20 == 0
+        logins = rng.randrange(0, 500)
+        users[f"user{index}"] = {
+            "created_at": time.strftime(TIME_FORMAT, time.localtime(base + rng.randrange(86400 * 365))),
+            "last_login": time.strftime(TIME_FORMAT, time.localtime(base + rng.randrange(86400 * 365))) if logins else "",
+            "login_count": logins,
+            "notes": [],
+            "settings": {"theme": "light" if index % 3 else "dark"},
+            "security": {
+                "failed_attempts": 5 if locked else rng.randrange(0, 3),
+                "is_locked": locked,
+                "lock_time": time.strftime(TIME_FORMAT, time.localtime(base)) if locked else None,
+                "lock_until": base + 900 if locked else None
+            },
+            "permissions": {"leitura": True, "escrita": index % 2 == 0, "remocao": index % 7 == 0}
+        }
+    return users
+
+def _measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede a memória de user_data em dicionários aninhados versus UserRecord.")
+    parser.add_argument("--users", type=int, default=100000, help="Número de usuários sintéticos")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    text = json.dumps(synthetic_users(args.users, args.seed))
+
+    dicts, dict_bytes, dict_time = _measure(lambda: json.loads(text))
+    lossless = all(UserRecord.from_dict(username, user).to_dict() == user for username, user in dicts.items())
+    del dicts
+
+    records, record_bytes, record_time = _measure(
+        lambda: {username: UserRecord.from_dict(username, user) for username, user in json.loads(text).items()}
+    )
+    compact = sum(1 for record in records.values() if record.extra is None)
+    del records
+
+    per_100k = 100000 / args.users
+    print(f"Usuários: {args.users}")
+    print(f"Dicionários aninhados: {dict_bytes / 2**20:.1f} MiB ({dict_bytes / args.users:.0f} B/usuário, carga {dict_time:.2f}s)")
+    print(f"UserRecord:            {record_bytes / 2**20:.1f} MiB ({record_bytes / args.users:.0f} B/usuário, carga {record_time:.2f}s)")
+    print(f"Economia por 100 mil usuários: {(dict_bytes - record_bytes) * per_100k / 2**20:.1f} MiB "
+          f"({(1 - record_bytes / dict_bytes) * 100:.0f}%)")
+    print(f"Conversão sem perdas: {'sim' if lossless else 'NÃO'} | registros totalmente compactos: {compact}/{args.users}")
+
+if __name__ == "__main__":
+    main()
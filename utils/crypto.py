@@ -1,11 +1,102 @@
+import os
+import hmac
+import json
+import time
 import hashlib
 import secrets
+from constants import KDF_CONFIG_FILE, DEFAULT_KDF_PARAMS
+from core.atomic_io import atomic_writer
+
+_kdf_params = None
 
 def generate_salt():
     return secrets.token_hex(16)
 
-def hash_password(password, salt):
-    return hashlib.sha256((password + salt).encode()).hexdigest()
+def _derive(password, salt, params):
+    name = params["name"]
+    if name == "scrypt":
+        n, r, p = params["n"], params["r"], params["p"]
+        return hashlib.scrypt(
+            password.encode(), salt=salt.encode(), n=n, r=r, p=p,
+            maxmem=256 * n * r * p + (1 << 20), dklen=32
+        ).hex()
+    if name == "pbkdf2_sha256":
+        return hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), params["iterations"]).hex()
+    raise ValueError(f"Algoritmo de hash desconhecido: {name}")
+
+def hash_password(password, salt, params=None):
+    if params is None:
+        return hashlib.sha256((password + salt).encode()).hexdigest()
+    return _derive(password, salt, params)
+
+def verify_password(stored_hash, stored_salt, provided_password, params=None):
+    return hmac.compare_digest(hash_password(provided_password, stored_salt, params), stored_hash)
+
+def get_kdf_params():
+    global _kdf_params
+    if _kdf_params is None:
+        try:
+            with open(KDF_CONFIG_FILE, 'r') as file:
+                _kdf_params = json.load(file)
+        except (OSError, json.JSONDecodeError):
+            _kdf_params = dict(DEFAULT_KDF_PARAMS)
+    return _kdf_params
+
+def save_kdf_params(params):
+    global _kdf_params
+    directory = os.path.dirname(KDF_CONFIG_FILE)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    atomic_writer.write(KDF_CONFIG_FILE, lambda file: json.dump(params, file, indent=4))
+    _kdf_params = params
+
+def create_password_record(password, params=None):
+    if params is None:
+        params = get_kdf_params()
+    salt = generate_salt()
+    return {
+        "password": hash_password(password, salt, params),
+        "salt": salt,
+        "kdf": dict(params)
+    }
+
+def verify_password_record(record, provided_password):
+    return verify_password(record["password"], record["salt"], provided_password, record.get("kdf"))
+
+def _cost(params):
+    if params is None:
+        return 0
+    if params["name"] == "scrypt":
+        return params["n"] * params["r"] * params["p"]
+    return params["iterations"]
+
+def needs_rehash(record, params=None):
+    if params is None:
+        params = get_kdf_params()
+    current = record.get("kdf")
+    if current is None or current["name"] != params["name"]:
+        return True
+    return _cost(current) < _cost(params)
+
+def _measure(params, rounds=3):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        _derive("calibracao", "0" * 32, params)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
 
-def verify_password(stored_hash, stored_salt, provided_password):
-    return hash_password(provided_password, stored_salt) == stored_hash
+def calibrate(target_ms=50, algorithm="scrypt"):
+    target = target_ms / 1000
+    if algorithm == "scrypt":
+        params = {"name": "scrypt", "n": 1 << 10, "r": 8, "p": 1}
+        while _measure(params) < target and params["n"] < (1 << 20):
+            params["n"] <<= 1
+        return params, _measure(params) * 1000
+    if algorithm == "pbkdf2_sha256":
+        params = {"name": "pbkdf2_sha256", "iterations": 10000}
+        elapsed = _measure(params)
+        params["iterations"] = max(10000, int(params["iterations"] * target / elapsed))
+        return params, _measure(params) * 1000
+    raise ValueError(f"Algoritmo de hash desconhecido: {algorithm}")
@@ -0,0 +1,96 @@
+import os
+import sys
+import json
+import queue
+import atexit
+import logging
+import threading
+import logging.handlers
+from datetime import datetime
+from constants import LOG_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_LEVELS
+
+ROOT_LOGGER = "role_bac"
+EVENT_FIELDS = ("user", "file", "latency_ms")
+
+_listener = None
+_queue_handler = None
+_setup_lock = threading.Lock()
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        event = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "subsystem": record.name.split(".", 1)[-1],
+            "event": getattr(record, "event", None),
+            "message": record.getMessage()
+        }
+        for field in EVENT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                event[field] = value
+        if record.exc_info:
+            event["exception"] = self.formatException(record.exc_info)
+        return json.dumps(event, ensure_ascii=False)
+
+class ConsoleFormatter(logging.Formatter):
+    def format(self, record):
+        message = f"[{datetime.fromtimestamp(record.created)}] {record.getMessage()}"
+        if record.exc_info:
+            message += "\n" + self.formatException(record.exc_info)
+        return message
+
+def setup_logging():
+    global _listener, _queue_handler
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        handlers = []
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(ConsoleFormatter())
+        handlers.append(console)
+
+        try:
+            directory = os.path.dirname(LOG_FILE)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            file_handler = logging.handlers.RotatingFileHandler(
+                LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+            )
+            file_handler.setFormatter(JsonFormatter())
+            handlers.append(file_handler)
+        except OSError as e:
+            print(f"Erro ao abrir arquivo de log {LOG_FILE}: {e}")
+
+        log_queue = queue.SimpleQueue()
+        root = logging.getLogger(ROOT_LOGGER)
+        _queue_handler = logging.handlers.QueueHandler(log_queue)
+        root.addHandler(_queue_handler)
+        root.propagate = False
+        for subsystem, level in LOG_LEVELS.items():
+            name = ROOT_LOGGER if subsystem == "*" else f"{ROOT_LOGGER}.{subsystem}"
+            logging.getLogger(name).setLevel(level)
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+def shutdown_logging():
+    global _listener, _queue_handler
+    with _setup_lock:
+        if _listener is None:
+            return
+        logging.getLogger(ROOT_LOGGER).removeHandler(_queue_handler)
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        _queue_handler = None
+
+def get_logger(subsystem):
+    return logging.getLogger(f"{ROOT_LOGGER}.{subsystem}")
+
+def log_event(logger, event, message, level=logging.INFO, **fields):
+    if logger.isEnabledFor(level):
+        logger.log(level, message, extra={"event": event, **fields})